@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-08-26 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0006_rename_pages_n8nex_workflo_7f3978_idx_pages_n8nex_workflo_77736a_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usertelegramcredential',
+            index=models.Index(fields=['user', 'created_at'], name='pages_usert_user_id_eb63fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userwhatsappinstance',
+            index=models.Index(fields=['user', 'instance_name'], name='pages_userw_user_id_4db1ba_idx'),
+        ),
+    ]
@@ -24,6 +24,9 @@ class UserTelegramCredential(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.n8n_credential_id})"
@@ -47,6 +50,9 @@ class UserWhatsAppInstance(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["user", "instance_name"]),
+        ]
 
     def __str__(self):
         return f"{self.instance_name} ({self.whatsapp_number})"
@@ -0,0 +1,39 @@
+"""
+Background tasks for apps.pages.
+
+The project has no Celery/RQ worker, so slow outbound provisioning work is
+pushed onto a daemon thread instead. The status-polling endpoint only needs
+to answer "connected" — it should not block its JSON response on the two
+15 s credential-creation POSTs to n8n.
+"""
+import threading
+
+from django.contrib.auth.models import User
+
+
+def provision_n8n_credentials(user_id):
+    """
+    Create n8n credentials for a user. Safe to run off-request: looks the
+    user up again by id so no request-bound objects cross the thread.
+    """
+    from apps.pages.views import create_n8n_credentials_for_user
+
+    user = User.objects.filter(pk=user_id).first()
+    if not user:
+        print(f"[tasks] provision_n8n_credentials: user {user_id} not found", flush=True)
+        return
+
+    success, results = create_n8n_credentials_for_user(user)
+    print(f"[tasks] Credentials creation for {user.email}: success={success}, results={results}", flush=True)
+
+
+def provision_n8n_credentials_async(user_id):
+    """Fire-and-forget wrapper; returns immediately."""
+    thread = threading.Thread(
+        target=provision_n8n_credentials,
+        args=(user_id,),
+        name=f"n8n-creds-{user_id}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
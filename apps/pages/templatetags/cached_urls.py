@@ -0,0 +1,33 @@
+"""
+Memoized reverse() for parameter-free named routes.
+
+The sidebar and navigation reverse the same handful of static route names
+on every page render; reverse() recomputes them through the namespace dict
+each time. creverse caches the result per process and is invalidated when
+settings change (e.g. overridden urlconfs in tests).
+"""
+from functools import lru_cache
+
+from django import template
+from django.test.signals import setting_changed
+from django.urls import reverse
+
+register = template.Library()
+
+
+@lru_cache(maxsize=256)
+def _cached_reverse(name):
+    return reverse(name)
+
+
+def _clear_cache(**kwargs):
+    _cached_reverse.cache_clear()
+
+
+setting_changed.connect(_clear_cache)
+
+
+@register.simple_tag
+def creverse(name):
+    """{% creverse 'apps.pages:credentials' %} - reverse() with memoization."""
+    return _cached_reverse(name)
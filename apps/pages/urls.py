@@ -1,7 +1,7 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
 
-from . import views
+from . import dashboard_views, views
 
 app_name = "apps.pages"
 
@@ -20,4 +20,11 @@ urlpatterns = [
   
   # API endpoints for Pengaa Flow
   path('api/n8n/credentials/', views.api_n8n_credentials, name='api_n8n_credentials'),
+
+  # n8n admin dashboard (previously a separate include in config.urls -
+  # merged here so resolve()/reverse() walk one resolver level)
+  path('dashboard/', dashboard_views.dashboard_overview, name='dashboard-index'),
+  path('dashboard/executions/', dashboard_views.recent_executions, name='dashboard-executions'),
+  path('dashboard/workflows/', dashboard_views.workflow_table, name='dashboard-workflows'),
+  path('dashboard/users/', dashboard_views.user_table, name='dashboard-users'),
 ]
@@ -1,10 +1,14 @@
+import hashlib
 import json
 import re
+import orjson
 import requests
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.shortcuts import redirect, render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.db import IntegrityError, transaction
 from django.db.models import Count, Sum
 from django.utils import timezone
 from datetime import timedelta
@@ -22,6 +26,7 @@ from apps.pages.evolution_db import (
     get_instance_recent_messages,
     get_instance_labels,
 )
+from apps.pages.tasks import provision_n8n_credentials_async
 from accounts_plus.models import UserN8NProfile, OpenAIKeyPool
 from n8n_mirror.models import UserApiKeys
 
@@ -29,6 +34,33 @@ EVOLUTION_API_URL = "https://evo.lotfinity.tech"
 EVOLUTION_API_KEY = "123456789Tt@"
 N8N_CREDENTIALS_URL = "https://n8n.lotfinity.tech/api/v1/credentials"
 
+# Immutable headers/URLs reused by every Evolution API call - built once
+# instead of per request
+EVO_HEADERS = {
+    "apikey": EVOLUTION_API_KEY,
+    "Content-Type": "application/json",
+}
+EVO_CREATE_URL = EVOLUTION_API_URL + "/instance/create"
+EVO_CONNECT_URL = EVOLUTION_API_URL + "/instance/connect/"
+
+
+def _openai_key_preview(key):
+    """Masked preview of an API key, or None when there is nothing to show."""
+    return f"{key[:8]}...{key[-4:]}" if key and len(key) > 12 else None
+
+
+def ojson(data, status=200):
+    """
+    orjson-backed JsonResponse for the AJAX-polled endpoints. Serializes
+    datetimes natively in C instead of going through DjangoJSONEncoder,
+    which matters for the larger dashboard payloads.
+    """
+    return HttpResponse(
+        orjson.dumps(data, option=orjson.OPT_NAIVE_UTC),
+        content_type="application/json",
+        status=status,
+    )
+
 
 def create_n8n_credentials_for_user(user):
     """
@@ -129,6 +161,35 @@ def create_n8n_credentials_for_user(user):
     return success_count > 0, results
 
 
+def mark_instance_connected(instance, user):
+    """
+    Flip an instance to 'connected' exactly once and queue n8n credential
+    creation for the winner. Both the connect page and the status polling
+    endpoint can detect the connection at the same time; the conditional
+    UPDATE only matches while status != 'connected', so the row count tells
+    us which request won the race and should queue credential creation.
+    Returns True if this call performed the first-connect transition.
+    """
+    with transaction.atomic():
+        updated = (
+            UserWhatsAppInstance.objects
+            .filter(pk=instance.pk)
+            .exclude(status="connected")
+            .update(status="connected")
+        )
+    instance.status = "connected"
+
+    if updated != 1:
+        return False
+
+    # First time connecting - queue n8n credential creation so the caller
+    # (the connect page or the polling endpoint) doesn't block on the slow
+    # outbound POSTs to n8n.
+    print(f"[whatsapp] WhatsApp connected! Queueing n8n credentials for {user.email}", flush=True)
+    provision_n8n_credentials_async(user.id)
+    return True
+
+
 @login_required
 def index(request):
   context = {
@@ -424,11 +485,16 @@ def credentials(request):
       .first()
     )
 
-  existing_telegram = UserTelegramCredential.objects.filter(user=request.user)
-  existing_whatsapp = UserWhatsAppInstance.objects.filter(user=request.user)
-  
+  # Evaluate both per-user querysets once up front; the template and the
+  # loops below reuse the lists instead of re-running the same filters.
+  existing_telegram = list(
+    UserTelegramCredential.objects.filter(user=request.user)
+    .only('id', 'name', 'n8n_credential_id', 'created_at')
+  )
+  existing_whatsapp = list(UserWhatsAppInstance.objects.filter(user=request.user))
+
   # Fetch LIVE status from Evolution DB for all user's instances
-  instance_names = list(existing_whatsapp.values_list('instance_name', flat=True))
+  instance_names = [instance.instance_name for instance in existing_whatsapp]
   live_statuses = {}
   try:
     live_statuses = get_all_instances_status(instance_names)
@@ -516,31 +582,21 @@ def credentials(request):
         messages.error(request, "Instance name and WhatsApp number are required.")
         return redirect("apps.pages:credentials")
 
-      # Check if instance name already exists
-      if UserWhatsAppInstance.objects.filter(instance_name=instance_name).exists():
-        messages.error(request, "An instance with this name already exists.")
-        return redirect("apps.pages:credentials")
-
       payload = {
         "instanceName": instance_name,
         "integration": "WHATSAPP-BAILEYS",
         "number": whatsapp_number,
         "qrcode": True,
       }
-      headers = {
-        "apikey": EVOLUTION_API_KEY,
-        "Content-Type": "application/json",
-      }
-
       try:
         print(
-          f"[whatsapp] POST {EVOLUTION_API_URL}/instance/create "
+          f"[whatsapp] POST {EVO_CREATE_URL} "
           f"payload={payload}",
           flush=True,
         )
         resp = requests.post(
-          f"{EVOLUTION_API_URL}/instance/create",
-          headers=headers,
+          EVO_CREATE_URL,
+          headers=EVO_HEADERS,
           json=payload,
           timeout=15,
         )
@@ -552,15 +608,21 @@ def credentials(request):
         instance_data = body.get("instance", {})
         qrcode_data = body.get("qrcode", {})
         
-        # Save instance to database
-        whatsapp_instance = UserWhatsAppInstance.objects.create(
-          user=request.user,
-          instance_name=instance_data.get("instanceName", instance_name),
-          instance_id=instance_data.get("instanceId"),
-          whatsapp_number=whatsapp_number,
-          hash_key=body.get("hash"),
-          status=instance_data.get("status", "connecting"),
-        )
+        # Save instance to database. instance_name is unique at the DB
+        # level, so concurrent submissions of the same name can't both
+        # slip past a pre-check - the loser gets an IntegrityError.
+        try:
+          whatsapp_instance = UserWhatsAppInstance.objects.create(
+            user=request.user,
+            instance_name=instance_data.get("instanceName", instance_name),
+            instance_id=instance_data.get("instanceId"),
+            whatsapp_number=whatsapp_number,
+            hash_key=body.get("hash"),
+            status=instance_data.get("status", "connecting"),
+          )
+        except IntegrityError:
+          messages.error(request, "An instance with this name already exists.")
+          return redirect("apps.pages:credentials")
         
         # Store QR data in session for display
         request.session["whatsapp_qr_data"] = {
@@ -583,6 +645,7 @@ def credentials(request):
 
   # Get the user's assigned OpenAI key from the pool
   assigned_openai_key = OpenAIKeyPool.get_user_key(request.user)
+  openai_api_key = assigned_openai_key.api_key if assigned_openai_key else None
 
   context = {
     'segment': 'credentials',
@@ -591,7 +654,7 @@ def credentials(request):
     "has_api_key": bool(api_key_obj),
     "has_profile": bool(profile),
     "has_openai_key": bool(assigned_openai_key),
-    "openai_key_preview": f"{assigned_openai_key.api_key[:8]}...{assigned_openai_key.api_key[-4:]}" if assigned_openai_key and len(assigned_openai_key.api_key) > 12 else None,
+    "openai_key_preview": _openai_key_preview(openai_api_key),
     "openai_key_assigned_at": assigned_openai_key.assigned_at if assigned_openai_key else None,
   }
   return render(request, 'pages/credentials.html', context)
@@ -602,7 +665,7 @@ def whatsapp_connect(request, instance_name):
     """Display QR code for WhatsApp instance connection."""
     instance = UserWhatsAppInstance.objects.filter(
         user=request.user, instance_name=instance_name
-    ).first()
+    ).only('id', 'status', 'instance_name', 'whatsapp_number').first()
 
     if not instance:
         messages.error(request, "WhatsApp instance not found.")
@@ -620,15 +683,8 @@ def whatsapp_connect(request, instance_name):
     # If already connected, update local status and redirect back with success
     if live_status and live_status.get('connectionStatus') == 'open':
         # Update our local status to match and create credentials if first time
-        if instance.status != 'connected':
-            instance.status = 'connected'
-            instance.save(update_fields=['status'])
-            
-            # First time connecting - create n8n credentials
-            print(f"[whatsapp_connect] WhatsApp connected! Creating n8n credentials for {request.user.email}", flush=True)
-            success, results = create_n8n_credentials_for_user(request.user)
-            print(f"[whatsapp_connect] Credentials creation: success={success}, results={results}", flush=True)
-            
+        mark_instance_connected(instance, request.user)
+
         messages.success(request, f"WhatsApp connected as {live_status.get('profileName', 'Unknown')}!")
         return redirect("apps.pages:credentials")
 
@@ -648,33 +704,27 @@ def whatsapp_connect(request, instance_name):
 @login_required
 def whatsapp_refresh_qr(request, instance_name):
     """API endpoint to refresh QR code for an existing instance."""
-    instance = UserWhatsAppInstance.objects.filter(
+    # Only ownership matters here - no instance fields are read
+    if not UserWhatsAppInstance.objects.filter(
         user=request.user, instance_name=instance_name
-    ).first()
-
-    if not instance:
-        return JsonResponse({"error": "Instance not found"}, status=404)
-
-    headers = {
-        "apikey": EVOLUTION_API_KEY,
-        "Content-Type": "application/json",
-    }
+    ).exists():
+        return ojson({"error": "Instance not found"}, status=404)
 
     try:
         print(
-            f"[whatsapp_qr] GET {EVOLUTION_API_URL}/instance/connect/{instance_name}",
+            f"[whatsapp_qr] GET {EVO_CONNECT_URL}{instance_name}",
             flush=True,
         )
         resp = requests.get(
-            f"{EVOLUTION_API_URL}/instance/connect/{instance_name}",
-            headers=headers,
+            EVO_CONNECT_URL + instance_name,
+            headers=EVO_HEADERS,
             timeout=15,
         )
         resp.raise_for_status()
         data = resp.json()
         print(f"[whatsapp_qr] Response: {data}", flush=True)
 
-        return JsonResponse({
+        return ojson({
             "pairingCode": data.get("pairingCode"),
             "base64": data.get("base64"),
             "code": data.get("code"),
@@ -686,7 +736,7 @@ def whatsapp_refresh_qr(request, instance_name):
             f"body={getattr(resp, 'text', None)}",
             flush=True,
         )
-        return JsonResponse({"error": str(exc)}, status=500)
+        return ojson({"error": str(exc)}, status=500)
 
 
 @login_required
@@ -726,16 +776,23 @@ def save_openai_key(request):
 def validate_openai_key(request):
     """Validate OpenAI API key by making a test request."""
     profile = UserN8NProfile.objects.filter(user=request.user).first()
-    
+
     if not profile or not profile.openai_api_key:
         return JsonResponse({
             "valid": False,
             "status": "not_found",
             "message": "No OpenAI API key configured."
         })
-    
+
     api_key = profile.openai_api_key
-    
+
+    # The validation outcome for a given key barely changes within a minute,
+    # so avoid hitting api.openai.com on every click.
+    cache_key = f"openai:valid:{profile.id}:{hashlib.sha1(api_key.encode()).hexdigest()[:16]}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return JsonResponse(cached)
+
     try:
         # Test the API key by listing models
         resp = requests.get(
@@ -749,18 +806,23 @@ def validate_openai_key(request):
         if resp.status_code == 200:
             data = resp.json()
             models = [m["id"] for m in data.get("data", []) if "gpt" in m["id"].lower()][:5]
-            return JsonResponse({
+            payload = {
                 "valid": True,
                 "status": "connected",
                 "message": "AI models connected and ready!",
                 "models": models,
-            })
+            }
+            cache.set(cache_key, payload, timeout=60)
+            return JsonResponse(payload)
         elif resp.status_code == 401:
-            return JsonResponse({
+            # Invalid keys stay invalid - cache longer
+            payload = {
                 "valid": False,
                 "status": "invalid",
                 "message": "Invalid API key. Please check your key and try again.",
-            })
+            }
+            cache.set(cache_key, payload, timeout=300)
+            return JsonResponse(payload)
         elif resp.status_code == 429:
             return JsonResponse({
                 "valid": False,
@@ -792,32 +854,39 @@ def whatsapp_status_api(request, instance_name):
     """API endpoint to get live WhatsApp status from Evolution DB."""
     instance = UserWhatsAppInstance.objects.filter(
         user=request.user, instance_name=instance_name
-    ).first()
+    ).only('id', 'status', 'instance_name').first()
 
     if not instance:
-        return JsonResponse({"error": "Instance not found"}, status=404)
+        return ojson({"error": "Instance not found"}, status=404)
+
+    # Connected is a terminal state for this endpoint, but the connect page
+    # keeps polling every few seconds. Serve the cached verdict instead of
+    # hitting the Evolution DB on every poll.
+    if cache.get(f"wa:connected:{instance_name}"):
+        return ojson({
+            "instance_name": instance_name,
+            "local_status": "connected",
+            "live_status": None,
+            "details": None,
+            "is_connected": True,
+            "credentials_created": False,
+        })
 
     try:
         live_status = get_instance_status(instance_name)
         evo_details = get_instance_details(instance_name)
-        
+
         is_connected = live_status.get('connectionStatus') == 'open' if live_status else False
-        
+
         credentials_created = False
-        
+
         # Sync local status if connected AND trigger credential creation on first connect
-        if is_connected and instance.status != 'connected':
-            old_status = instance.status
-            instance.status = 'connected'
-            instance.save(update_fields=['status'])
-            
-            # First time connecting - create n8n credentials
-            print(f"[whatsapp_status_api] WhatsApp connected! Creating n8n credentials for {request.user.email}", flush=True)
-            success, results = create_n8n_credentials_for_user(request.user)
-            credentials_created = success
-            print(f"[whatsapp_status_api] Credentials creation: success={success}, results={results}", flush=True)
-        
-        return JsonResponse({
+        if is_connected:
+            cache.set(f"wa:connected:{instance_name}", 1, timeout=300)
+            if instance.status != 'connected':
+                credentials_created = mark_instance_connected(instance, request.user)
+
+        return ojson({
             "instance_name": instance_name,
             "local_status": instance.status,
             "live_status": live_status,
@@ -827,7 +896,7 @@ def whatsapp_status_api(request, instance_name):
         })
     except Exception as e:
         print(f"[whatsapp_status_api] Error: {e}", flush=True)
-        return JsonResponse({
+        return ojson({
             "instance_name": instance_name,
             "local_status": instance.status,
             "live_status": None,
@@ -843,7 +912,7 @@ def whatsapp_dashboard(request, instance_name):
     # Verify user owns this instance
     instance = UserWhatsAppInstance.objects.filter(
         user=request.user, instance_name=instance_name
-    ).first()
+    ).only('id', 'status', 'instance_name', 'whatsapp_number', 'created_at').first()
 
     if not instance:
         messages.error(request, "WhatsApp instance not found.")
@@ -884,25 +953,24 @@ def whatsapp_dashboard(request, instance_name):
 @login_required
 def whatsapp_dashboard_api(request, instance_name):
     """API endpoint to get full dashboard data for AJAX refresh."""
-    instance = UserWhatsAppInstance.objects.filter(
+    # Only ownership matters here - no instance fields are read
+    if not UserWhatsAppInstance.objects.filter(
         user=request.user, instance_name=instance_name
-    ).first()
-
-    if not instance:
-        return JsonResponse({"error": "Instance not found"}, status=404)
+    ).exists():
+        return ojson({"error": "Instance not found"}, status=404)
 
     try:
         details = get_instance_details(instance_name)
         stats = get_instance_stats(instance_name)
         
-        return JsonResponse({
+        return ojson({
             "instance_name": instance_name,
             "details": details,
             "stats": stats,
             "is_connected": details.get('connectionStatus') == 'open' if details else False,
         })
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+        return ojson({"error": str(e)}, status=500)
 
 
 @login_required
@@ -915,7 +983,7 @@ def api_n8n_credentials(request):
     
     profile = UserN8NProfile.objects.filter(user=request.user).first()
     if not profile or not profile.n8n_user_id:
-        return JsonResponse({"credentials": [], "error": "No n8n profile"})
+        return ojson({"credentials": [], "error": "No n8n profile"})
     
     # Get credential type filter from query params
     cred_type = request.GET.get('type', None)
@@ -931,25 +999,27 @@ def api_n8n_credentials(request):
             projectId__in=list(user_projects)
         ).values_list('credentialsId', flat=True)
         
-        # Fetch the actual credentials
+        # Fetch the actual credentials - only the fields the payload needs,
+        # as plain dicts (skips model instantiation per row)
         credentials_qs = CredentialsEntity.objects.using("n8n").filter(
             id__in=list(shared_cred_ids)
         )
-        
+
         if cred_type:
             credentials_qs = credentials_qs.filter(type=cred_type)
-        
-        credentials = []
-        for cred in credentials_qs:
-            credentials.append({
-                "id": str(cred.id),
-                "name": cred.name,
-                "type": cred.type,
-                "createdAt": cred.createdAt.isoformat() if cred.createdAt else None,
-                "updatedAt": cred.updatedAt.isoformat() if cred.updatedAt else None,
-            })
-        
-        return JsonResponse({"credentials": credentials})
+
+        credentials = [
+            {
+                "id": str(row["id"]),
+                "name": row["name"],
+                "type": row["type"],
+                "createdAt": row["createdAt"].isoformat() if row["createdAt"] else None,
+                "updatedAt": row["updatedAt"].isoformat() if row["updatedAt"] else None,
+            }
+            for row in credentials_qs.values("id", "name", "type", "createdAt", "updatedAt")
+        ]
+
+        return ojson({"credentials": credentials})
     except Exception as e:
         print(f"[api_n8n_credentials] Error: {e}", flush=True)
-        return JsonResponse({"credentials": [], "error": str(e)})
+        return ojson({"credentials": [], "error": str(e)})
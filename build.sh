@@ -13,3 +13,8 @@ python manage.py collectstatic --no-input
 python manage.py makemigrations
 python manage.py migrate
 
+# Pre-bake the OpenAPI schema so /api/schema/ and /api/openapi.json serve
+# static files instead of regenerating the schema per request
+python manage.py spectacular --file schema.yml
+python manage.py spectacular --format openapi-json --file openapi.json
+
@@ -50,9 +50,14 @@ if RENDER_EXTERNAL_HOSTNAME:
 
 # Application definition
 
+# API-only workers can set ENABLE_ADMIN=False to skip admin autodiscovery
+# (importing every app's admin.py and building ModelAdmin registries is a
+# large share of process startup they never use).
+ENABLE_ADMIN = str2bool(os.environ.get('ENABLE_ADMIN', 'True'))
+
 INSTALLED_APPS = [
     'jazzmin',
-    "django.contrib.admin",
+    "django.contrib.admin" if ENABLE_ADMIN else "django.contrib.admin.apps.SimpleAdminConfig",
     "accounts_plus",
     'admin_datta.apps.AdminDattaConfig',  # Re-enabled - module is installed
     "ckeditor",
@@ -168,6 +173,10 @@ DATABASES["n8n"] = {
     "PASSWORD": N8N_DB_PASSWORD,
     "HOST": N8N_DB_HOST,
     "PORT": N8N_DB_PORT,
+    # Keep connections alive between requests - the dashboard hits this
+    # alias on nearly every page, and PG connection setup costs 5-50ms
+    "CONN_MAX_AGE": 60,
+    "CONN_HEALTH_CHECKS": True,
 }
 
 # Evolution API database (for SQL Explorer)
@@ -179,6 +188,9 @@ if EVO_DB_NAME and EVO_DB_USER:
         "PASSWORD": EVO_DB_PASSWORD,
         "HOST": EVO_DB_HOST,
         "PORT": EVO_DB_PORT,
+        # Same persistent-connection treatment - polled by the WhatsApp views
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
     }
 
 DATABASE_ROUTERS = ["project_root.db_routers.N8nRouter"]
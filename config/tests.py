@@ -0,0 +1,46 @@
+"""
+Regression guard for URLconf import cost.
+
+config.urls used to eagerly import drf_spectacular, DRF authtoken views
+and debug_toolbar, dominating worker cold-start. This test re-imports the
+module in a subprocess under `python -X importtime` and fails if its
+cumulative import time creeps back up, so new eager imports get caught in
+review instead of in production restart latency.
+"""
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+# Generous default so slow CI boxes don't flake; override to tighten.
+IMPORT_BUDGET_US = int(os.environ.get("URLS_IMPORT_BUDGET_US", 300_000))
+
+
+class UrlconfImportTimeTest(unittest.TestCase):
+    def test_config_urls_import_stays_cheap(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="config.settings")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             "import django; django.setup(); import config.urls"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        # importtime lines: "import time: <self> | <cumulative> | <module>"
+        match = re.search(
+            r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*config\.urls\s*$",
+            result.stderr,
+            re.MULTILINE,
+        )
+        self.assertIsNotNone(match, "config.urls not found in importtime output")
+        cumulative_us = int(match.group(1))
+        self.assertLess(
+            cumulative_us,
+            IMPORT_BUDGET_US,
+            f"config.urls import took {cumulative_us}us "
+            f"(budget {IMPORT_BUDGET_US}us) - a heavy module is being "
+            f"imported eagerly again",
+        )
@@ -13,47 +13,149 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from functools import lru_cache
+
 from django.conf import settings
 from django.contrib import admin
+from django.http import HttpResponse
 from django.urls import include, path
-from rest_framework.authtoken.views import obtain_auth_token # <-- NEW
-from rest_framework.renderers import JSONOpenAPIRenderer
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
-from drf_spectacular.renderers import OpenApiJsonRenderer
+from django.views.decorators.cache import cache_page
+
+
+def _obtain_auth_token(request, *args, **kwargs):
+    """Load rest_framework.authtoken.views on the first POST to /login/jwt/."""
+    from rest_framework.authtoken.views import obtain_auth_token
+    return obtain_auth_token(request, *args, **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _generated_schema():
+    """
+    Generate the OpenAPI schema once per process. Both the YAML and JSON
+    endpoints share this dict, so the second format only pays serialization
+    instead of re-walking every viewset and serializer.
+    """
+    from drf_spectacular.generators import SchemaGenerator
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def _spectacular_view(name):
+    """
+    Defer drf_spectacular imports to the first request that actually hits a
+    schema/docs URL. The schema machinery (inspectors, uritemplate,
+    jsonschema, YAML) dominates startup cost, and most worker processes
+    never serve these endpoints.
+    """
+    @lru_cache(maxsize=1)
+    def build():
+        from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+        from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+        def yaml_schema(request, *args, **kwargs):
+            return HttpResponse(
+                OpenApiYamlRenderer().render(_generated_schema(), renderer_context={}),
+                content_type='application/vnd.oai.openapi; charset=utf-8',
+            )
+
+        def json_schema(request, *args, **kwargs):
+            return HttpResponse(
+                OpenApiJsonRenderer().render(_generated_schema(), renderer_context={}),
+                content_type='application/vnd.oai.openapi+json; charset=utf-8',
+            )
+
+        return {
+            'schema': yaml_schema,
+            'schema-json': json_schema,
+            'swagger-ui': SpectacularSwaggerView.as_view(url_name='schema'),
+            'redoc': SpectacularRedocView.as_view(url_name='schema'),
+        }[name]
+
+    def view(request, *args, **kwargs):
+        return build()(request, *args, **kwargs)
+
+    return view
 
 
+# Pre-baked schema files written at build time (build.sh runs
+# `manage.py spectacular`). Serving these bypasses the per-request schema
+# regeneration, which walks every viewset/serializer on each hit.
+_SCHEMA_FILES = {
+    'schema': (settings.BASE_DIR / 'schema.yml', 'application/vnd.oai.openapi; charset=utf-8'),
+    'schema-json': (settings.BASE_DIR / 'openapi.json', 'application/json'),
+}
+
+
+def _schema_file_view(name):
+    """
+    Serve the pre-generated schema file, loaded once per process. Falls back
+    to live drf-spectacular generation when the file has not been baked
+    (e.g. a dev checkout before the first build).
+    """
+    file_path, content_type = _SCHEMA_FILES[name]
+    live_view = _spectacular_view(name)
+
+    @lru_cache(maxsize=1)
+    def load():
+        try:
+            return file_path.read_bytes()
+        except OSError:
+            return None
+
+    def view(request, *args, **kwargs):
+        data = load()
+        if data is None:
+            return live_view(request, *args, **kwargs)
+        response = HttpResponse(data, content_type=content_type)
+        response['Cache-Control'] = 'max-age=3600'
+        return response
+
+    return view
+
+
+# Ordered by hit frequency: resolve() walks this list linearly, so the
+# hottest subtrees come first and the unique-prefix includes reject
+# non-matching paths in one comparison. Relative order of the empty-prefix
+# includes that can shadow each other (accounts_plus vs admin_datta) is
+# preserved.
 urlpatterns = [
-    path("", include(("accounts_plus.urls", "accounts_plus"), namespace="accounts_plus")),
-    path('', include(("apps.pages.urls", "apps.pages"), namespace="apps.pages")),
-    path('', include('apps.pages.dashboard_urls')),
+    # Hot: dashboard pages + AJAX polling endpoints live here
+    path('', include('apps.pages.urls')),
+    path("", include("accounts_plus.urls")),
+
+    # Unified API schema: all gmaps_leads API endpoints under /api/gmaps-leads/
+    path("api/gmaps-leads/", include("gmaps_leads.api_urls", namespace="gmaps_leads_api")),
+    # Google Maps Leads (UI only, API is unified above)
+    path("gmaps-leads/", include("gmaps_leads.urls")),
     path("n8n/", include("n8n_mirror.urls")),
+    # Admin is optional so API-only workers can skip autodiscovery
+    # (settings.ENABLE_ADMIN also swaps in SimpleAdminConfig)
+    *([path("admin/", admin.site.urls)] if settings.ENABLE_ADMIN else []),
     path("explorer/", include("explorer.urls")),  # SQL Explorer
-    # Google Maps Leads (UI only, API is unified below)
-    path("gmaps-leads/", include(("gmaps_leads.urls", "gmaps_leads"), namespace="gmaps_leads")),
-    path("", include('admin_datta.urls')),
-    path("admin/", admin.site.urls),
 
-    # Unified API schema: all gmaps_leads API endpoints under /api/gmaps-leads/
-    path("api/gmaps-leads/", include(("gmaps_leads.api_urls", "gmaps_leads_api"), namespace="gmaps_leads_api")),
+    # Cold: template/demo pages, kept last among the empty-prefix includes
+    path("", include('admin_datta.urls')),
 
     # OpenAPI 3.1 Schema (for AI/LLM integration)
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),  # YAML format
-    path('api/openapi.json', SpectacularAPIView.as_view(renderer_classes=[OpenApiJsonRenderer]), name='schema-json'),  # JSON for LLMs
-    path('api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('api/schema/', _schema_file_view('schema'), name='schema'),  # YAML format
+    path('api/openapi.json', _schema_file_view('schema-json'), name='schema-json'),  # JSON for LLMs
+    # The docs shells are static HTML that fetch /api/schema/ via JS - cache
+    # the rendered page so only the first hit pays the DRF view stack
+    path('api/schema/swagger/', cache_page(86400)(_spectacular_view('swagger-ui')), name='swagger-ui'),
+    path('api/schema/redoc/', cache_page(86400)(_spectacular_view('redoc')), name='redoc'),
 ]
 
 # Lazy-load on routing is needed
 # During the first build, API is not yet generated
 try:
-    urlpatterns.append( path("api/"      , include("api.urls"))    )
-    urlpatterns.append( path("login/jwt/", view=obtain_auth_token) )
-except:
+    import api.urls as _api_urls
+except ModuleNotFoundError:
     pass
+else:
+    urlpatterns.append( path("api/"      , include(_api_urls))       )
+    urlpatterns.append( path("login/jwt/", view=_obtain_auth_token) )
 
-# Debug toolbar URLs (only in DEBUG mode)
+# Debug toolbar URLs (only in DEBUG mode). The dotted string keeps the
+# debug_toolbar module from being imported at config.urls import time, and
+# insert() avoids rebuilding the whole urlpatterns list.
 if settings.DEBUG:
-    import debug_toolbar
-    urlpatterns = [
-        path("__debug__/", include(debug_toolbar.urls)),
-    ] + urlpatterns
+    urlpatterns.insert(0, path("__debug__/", include("debug_toolbar.urls")))
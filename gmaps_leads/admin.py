@@ -1,16 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 from django.contrib import admin
-from django.utils.html import format_html
+from django.core.cache import cache
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 from django.urls import reverse, path
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponseRedirect
-from django.db import models
-from django.db.models import Q
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.db import connection, models, transaction
+from django.db.models import Count, Exists, OuterRef, Q
 from django import forms
 from ckeditor.widgets import CKEditorWidget
-from .models import ScrapeJob, GmapsLead, WhatsAppContact, LeadWebsite, CustomizedContact
+from .models import (
+    ScrapeJob, GmapsLead, WhatsAppContact, LeadWebsite, CustomizedContact,
+    PHONE_TYPE_CASE, summarize_keywords,
+)
 from .services import create_scrape_job, refresh_job_status, import_job_results, GmapsScraperService
 
+# Short-lived cache of GmapsScraperService.get_all_jobs() for the sync view
+API_JOBS_CACHE_KEY = 'gmaps:api_jobs'
+
+# Static style/label maps for the row-render methods below. The changelist
+# calls those methods once per row, so keeping the dicts at module scope
+# avoids rebuilding them ~50x per page render.
+_JOB_STATUS_COLORS = {
+    'pending': '#ffc107',
+    'running': '#17a2b8',
+    'completed': '#28a745',
+    'failed': '#dc3545',
+}
+_WEBSITE_STATUS_COLORS = {
+    'pending': '#ffc107',
+    'scraping': '#17a2b8',
+    'completed': '#28a745',
+    'failed': '#dc3545',
+    'no_content': '#6c757d',
+}
+_PHONE_ICONS = {
+    'whatsapp': '📱',
+    'local': '☎️',
+    'other': '📞',
+}
+_PHONE_COLORS = {
+    'whatsapp': '#25D366',  # WhatsApp green
+    'local': '#666',
+    'other': '#999',
+}
+_PHONE_LABELS = {
+    'whatsapp': '📱 WhatsApp Eligible (Turkish Mobile 905XX)',
+    'local': '☎️ Local Landline (Turkish 902XX/903XX/904XX)',
+    'other': '📞 Other Number',
+    'none': '❌ No Phone Number',
+}
+_SOCIAL_ICONS = {
+    'facebook': '📘',
+    'twitter': '🐦',
+    'instagram': '📷',
+    'linkedin': '💼',
+    'youtube': '📺',
+    'tiktok': '🎵',
+    'whatsapp': '💬',
+}
+
+# Status values are closed choice sets, so the full badge HTML can be
+# rendered once per status at import time instead of running format_html
+# (parse + escape + join) for every row.
+_JOB_STATUS_BADGES = {
+    value: mark_safe(
+        f'<span style="background-color: {_JOB_STATUS_COLORS.get(value, "#6c757d")}; '
+        f'color: white; padding: 3px 10px; border-radius: 3px;">{value.upper()}</span>'
+    )
+    for value, _ in ScrapeJob.STATUS_CHOICES
+}
+_WEBSITE_STATUS_BADGES = {
+    value: mark_safe(
+        f'<span style="background-color: {_WEBSITE_STATUS_COLORS.get(value, "#6c757d")}; '
+        f'color: white; padding: 2px 8px; border-radius: 3px; font-size: 11px;">{value.upper()}</span>'
+    )
+    for value, _ in LeadWebsite.STATUS_CHOICES
+}
+
+# Constant snippets rendered on most changelist rows; nothing to escape,
+# so skip format_html's per-call parse entirely.
+_EMPTY_DASH = mark_safe('<span style="color: #999;">—</span>')
+_NO_BODY_PLAIN = mark_safe(
+    '<span style="color:#999;">No WhatsApp message generated yet.</span>'
+)
+
+
+@lru_cache(maxsize=None)
+def _admin_url_template(view_name):
+    """
+    Resolve a single-pk admin URL once and return it as a format template.
+
+    The link columns below call reverse() per changelist row; only the pk
+    varies, so resolving with a placeholder pk and substituting per row
+    skips the resolver walk on every call.
+    """
+    return reverse(view_name, args=[0]).replace('/0/', '/{}/')
+
+
 
 # Custom Filters
 class PhoneTypeFilter(admin.SimpleListFilter):
@@ -27,33 +118,14 @@ class PhoneTypeFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'whatsapp':
-            # Turkish mobile: 905XX (WhatsApp eligible)
-            return queryset.filter(
-                Q(phone__regex=r'^\+?905\d') |
-                Q(phone__regex=r'^905\d')
-            )
-        elif self.value() == 'local':
-            # Turkish landlines: 902XX, 903XX, 904XX
-            return queryset.filter(
-                Q(phone__regex=r'^\+?90[234]\d') |
-                Q(phone__regex=r'^90[234]\d')
-            )
-        elif self.value() == 'other':
-            # Has phone but not Turkish mobile or landline
-            return queryset.exclude(
-                phone__isnull=True
-            ).exclude(
-                phone=''
-            ).exclude(
-                Q(phone__regex=r'^\+?905\d') |
-                Q(phone__regex=r'^905\d')
-            ).exclude(
-                Q(phone__regex=r'^\+?90[234]\d') |
-                Q(phone__regex=r'^90[234]\d')
-            )
-        elif self.value() == 'none':
-            return queryset.filter(Q(phone__isnull=True) | Q(phone=''))
+        # GmapsLeadAdmin.get_queryset annotates _phone_type via
+        # PHONE_TYPE_CASE, so every branch is one filter over the indexed
+        # phone_normalized column instead of regex scans on raw phone.
+        val = self.value()
+        if val is None:
+            return queryset
+        if val in ('whatsapp', 'local', 'other', 'none'):
+            return queryset.filter(_phone_type=val)
         return queryset
 
 
@@ -69,9 +141,14 @@ class WebsiteFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'yes':
-            return queryset.exclude(website__isnull=True).exclude(website='')
-        elif self.value() == 'no':
+        val = self.value()
+        if val is None:
+            return queryset
+        if val == 'yes':
+            # One combined predicate instead of stacked .exclude() calls,
+            # each of which adds its own NOT wrapper to the WHERE clause
+            return queryset.exclude(Q(website__isnull=True) | Q(website=''))
+        elif val == 'no':
             return queryset.filter(Q(website__isnull=True) | Q(website=''))
         return queryset
 
@@ -88,10 +165,14 @@ class HasWhatsAppContactFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'yes':
-            return queryset.filter(whatsapp_contact__isnull=False)
-        elif self.value() == 'no':
-            return queryset.filter(whatsapp_contact__isnull=True)
+        val = self.value()
+        if val is None:
+            return queryset
+        if val in ('yes', 'no'):
+            # EXISTS short-circuits on the first matching contact; the old
+            # whatsapp_contact__isnull lookup LEFT JOINed the whole table
+            wa_exists = Exists(WhatsAppContact.objects.filter(lead_id=OuterRef('pk')))
+            return queryset.annotate(_has_wa=wa_exists).filter(_has_wa=(val == 'yes'))
         return queryset
 
 
@@ -141,29 +222,37 @@ class ScrapeJobAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # One aggregate in the changelist SELECT; the stored leads_count
+        # field reflects what the API reported and can lag behind imports.
+        # The full keywords list is only needed on the detail form - the
+        # changelist shows the stored preview.
+        return super().get_queryset(request).annotate(_leads_count=Count('leads')).defer('keywords')
+
+    def leads_count(self, obj):
+        # Detail view queryset is not annotated - fall back to the field.
+        return getattr(obj, '_leads_count', obj.leads_count)
+    leads_count.short_description = 'Leads'
+    leads_count.admin_order_field = '_leads_count'
+
     def status_badge(self, obj):
-        colors = {
-            'pending': '#ffc107',
-            'running': '#17a2b8',
-            'completed': '#28a745',
-            'failed': '#dc3545',
-        }
-        color = colors.get(obj.status, '#6c757d')
+        badge = _JOB_STATUS_BADGES.get(obj.status)
+        if badge is not None:
+            return badge
+        # Unknown status value - escape it the slow way
         return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>',
-            color, obj.status.upper()
+            '<span style="background-color: #6c757d; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>',
+            obj.status.upper()
         )
     status_badge.short_description = 'Status'
     
     def keywords_display(self, obj):
-        if obj.keywords:
-            return ', '.join(obj.keywords[:3]) + ('...' if len(obj.keywords) > 3 else '')
-        return '-'
+        return obj.keywords_preview or '-'
     keywords_display.short_description = 'Keywords'
     
     def job_actions(self, obj):
-        refresh_url = reverse('admin:gmaps_leads_scrapejob_refresh', args=[obj.pk])
-        import_url = reverse('admin:gmaps_leads_scrapejob_import', args=[obj.pk])
+        refresh_url = _admin_url_template('admin:gmaps_leads_scrapejob_refresh').format(obj.pk)
+        import_url = _admin_url_template('admin:gmaps_leads_scrapejob_import').format(obj.pk)
         
         buttons = f'<a class="button" href="{refresh_url}" style="margin-right: 5px;">Refresh</a>'
         if obj.status == 'completed':
@@ -190,16 +279,16 @@ class ScrapeJobAdmin(admin.ModelAdmin):
             date_parser = None
         
         service = GmapsScraperService()
-        api_jobs = service.get_all_jobs()
-        
+        # The HTTP fetch dominates this view; a short TTL absorbs the
+        # double-click / immediate re-sync case. ?nocache=1 forces a fetch.
+        if request.GET.get('nocache'):
+            cache.delete(API_JOBS_CACHE_KEY)
+        api_jobs = cache.get_or_set(API_JOBS_CACHE_KEY, service.get_all_jobs, timeout=30)
+
         if not api_jobs:
             messages.warning(request, 'No jobs found in scraper API (or API unreachable)')
             return HttpResponseRedirect(reverse('admin:gmaps_leads_scrapejob_changelist'))
         
-        existing_ids = set(ScrapeJob.objects.values_list('external_id', flat=True))
-        new_count = 0
-        updated_count = 0
-        
         status_map = {
             'pending': 'pending',
             'running': 'running',
@@ -208,7 +297,17 @@ class ScrapeJobAdmin(admin.ModelAdmin):
             'done': 'completed',
             'ok': 'completed',  # API uses 'ok' for completed jobs
         }
-        
+
+        # One SELECT for every job the API knows about, then one bulk INSERT
+        # and one bulk UPDATE - instead of a SELECT + save() per API job.
+        existing = ScrapeJob.objects.in_bulk(
+            [j.get('ID') or j.get('id') for j in api_jobs if j.get('ID') or j.get('id')],
+            field_name='external_id',
+        )
+        to_create = []
+        to_update = []
+        created_dates = {}  # external_id -> API-reported creation date
+
         for api_job in api_jobs:
             # API returns capitalized field names
             job_id = api_job.get('ID') or api_job.get('id')
@@ -216,34 +315,33 @@ class ScrapeJobAdmin(admin.ModelAdmin):
             job_status = api_job.get('Status') or api_job.get('status', 'unknown')
             job_date = api_job.get('Date') or api_job.get('date')
             job_data = api_job.get('Data') or api_job.get('data', {})
-            
+
             if not job_id:
                 continue
-            
+
             status = status_map.get(job_status.lower(), 'pending')
-            
-            if job_id in existing_ids:
+
+            if job_id in existing:
                 # Update existing
-                job = ScrapeJob.objects.get(external_id=job_id)
+                job = existing[job_id]
                 if job.status != status:
                     job.status = status
                     if status == 'completed':
                         job.completed_at = timezone.now()
-                    job.save()
-                    updated_count += 1
+                    to_update.append(job)
             else:
-                # Create new
-                created_at = None
                 if job_date and date_parser:
                     try:
-                        created_at = date_parser.parse(job_date)
+                        created_dates[job_id] = date_parser.parse(job_date)
                     except:
                         pass
-                
-                job = ScrapeJob.objects.create(
+
+                to_create.append(ScrapeJob(
                     external_id=job_id,
                     name=job_name,
                     keywords=job_data.get('keywords', []),
+                    # bulk_create skips save(), so sync the preview here
+                    keywords_preview=summarize_keywords(job_data.get('keywords', [])),
                     lang=job_data.get('lang', 'en'),
                     zoom=job_data.get('zoom', 15),
                     lat=job_data.get('lat'),
@@ -256,12 +354,20 @@ class ScrapeJobAdmin(admin.ModelAdmin):
                     proxies=job_data.get('proxies'),
                     status=status,
                     completed_at=timezone.now() if status == 'completed' else None,
-                )
-                if created_at:
-                    ScrapeJob.objects.filter(pk=job.pk).update(created_at=created_at)
-                new_count += 1
-        
-        messages.success(request, f'Synced from API: {new_count} new jobs, {updated_count} updated (Total in API: {len(api_jobs)})')
+                ))
+
+        with transaction.atomic():
+            created = ScrapeJob.objects.bulk_create(to_create, batch_size=500)
+            if to_update:
+                ScrapeJob.objects.bulk_update(to_update, ['status', 'completed_at'], batch_size=500)
+            # auto_now_add stamped the insert time; backfill the API dates
+            backfill = [j for j in created if j.external_id in created_dates]
+            for job in backfill:
+                job.created_at = created_dates[job.external_id]
+            if backfill:
+                ScrapeJob.objects.bulk_update(backfill, ['created_at'], batch_size=500)
+
+        messages.success(request, f'Synced from API: {len(to_create)} new jobs, {len(to_update)} updated (Total in API: {len(api_jobs)})')
         return HttpResponseRedirect(reverse('admin:gmaps_leads_scrapejob_changelist'))
     
     def refresh_view(self, request, pk):
@@ -311,6 +417,8 @@ class ScrapeJobAdmin(admin.ModelAdmin):
             
             try:
                 job = create_scrape_job(job_data, user=request.user)
+                # New job exists in the API now - drop the cached job list
+                cache.delete(API_JOBS_CACHE_KEY)
                 messages.success(request, f'Job "{job.name}" created and submitted!')
                 return HttpResponseRedirect(reverse('admin:gmaps_leads_scrapejob_change', args=[job.pk]))
             except Exception as e:
@@ -381,12 +489,16 @@ class GmapsLeadAdmin(admin.ModelAdmin):
         }),
     )
     
-    def city(self, obj):
-        if obj.complete_address and isinstance(obj.complete_address, dict):
-            return obj.complete_address.get('city', '-')
-        return '-'
-    city.short_description = 'City'
-    
+    def get_queryset(self, request):
+        # job_link dereferences job per row, so join it up front. The phone
+        # column only needs a yes/no on the WhatsApp contact - a boolean
+        # EXISTS is cheaper than joining the whole related row. _phone_type
+        # feeds PhoneTypeFilter and the phone column sort.
+        return super().get_queryset(request).select_related('job').annotate(
+            _phone_type=PHONE_TYPE_CASE,
+            _has_wa=Exists(WhatsAppContact.objects.filter(lead_id=OuterRef('pk'))),
+        )
+
     def website_link(self, obj):
         if obj.website:
             return format_html('<a href="{}" target="_blank">🔗 Visit</a>', obj.website)
@@ -402,7 +514,7 @@ class GmapsLeadAdmin(admin.ModelAdmin):
     
     def job_link(self, obj):
         if obj.job:
-            url = reverse('admin:gmaps_leads_scrapejob_change', args=[obj.job.pk])
+            url = _admin_url_template('admin:gmaps_leads_scrapejob_change').format(obj.job_id)
             return format_html('<a href="{}">{}</a>', url, obj.job.name[:20])
         return '-'
     job_link.short_description = 'Job'
@@ -410,24 +522,19 @@ class GmapsLeadAdmin(admin.ModelAdmin):
     def phone_display(self, obj):
         """Display phone with type indicator."""
         if not obj.phone:
-            return format_html('<span style="color: #999;">—</span>')
+            return _EMPTY_DASH
         
-        phone_type = obj.phone_type
-        icons = {
-            'whatsapp': '📱',
-            'local': '☎️',
-            'other': '📞',
-        }
-        colors = {
-            'whatsapp': '#25D366',  # WhatsApp green
-            'local': '#666',
-            'other': '#999',
-        }
-        icon = icons.get(phone_type, '')
-        color = colors.get(phone_type, '#000')
+        phone_type = getattr(obj, '_phone_type', None) or obj.phone_type
+        icon = _PHONE_ICONS.get(phone_type, '')
+        color = _PHONE_COLORS.get(phone_type, '#000')
         
-        # Check if WhatsApp contact exists
-        has_wa = hasattr(obj, 'whatsapp_contact') and obj.whatsapp_contact is not None
+        # _has_wa comes from the EXISTS annotation in get_queryset; fall
+        # back to the relation (without triggering a lazy fetch) for
+        # instances loaded outside the changelist
+        if hasattr(obj, '_has_wa'):
+            has_wa = obj._has_wa
+        else:
+            has_wa = getattr(obj, 'whatsapp_contact', None) is not None
         wa_badge = ' ✅' if has_wa else ''
         
         return format_html(
@@ -435,49 +542,32 @@ class GmapsLeadAdmin(admin.ModelAdmin):
             color, icon, obj.phone, wa_badge
         )
     phone_display.short_description = 'Phone'
-    phone_display.admin_order_field = 'phone'
+    phone_display.admin_order_field = '_phone_type'
     
     def phone_type_display(self, obj):
         """Display phone type in detail view."""
         phone_type = obj.phone_type
-        labels = {
-            'whatsapp': '📱 WhatsApp Eligible (Turkish Mobile 905XX)',
-            'local': '☎️ Local Landline (Turkish 902XX/903XX/904XX)',
-            'other': '📞 Other Number',
-            'none': '❌ No Phone Number',
-        }
-        return labels.get(phone_type, phone_type)
+        return _PHONE_LABELS.get(phone_type, phone_type)
     phone_type_display.short_description = 'Phone Type'
     
     @admin.action(description='📱 Extract WhatsApp contacts for selected leads')
     def extract_whatsapp_contacts(self, request, queryset):
         """Extract WhatsApp contacts from selected leads."""
-        created = 0
-        skipped = 0
-        errors = 0
-        
-        for lead in queryset:
-            if lead.phone_type != 'whatsapp':
-                skipped += 1
-                continue
-            
-            # Check if already extracted
-            if hasattr(lead, 'whatsapp_contact') and lead.whatsapp_contact:
-                skipped += 1
-                continue
-            
-            try:
-                WhatsAppContact.create_from_lead(lead)
-                created += 1
-            except Exception as e:
-                errors += 1
-        
+        # Fetch only what classification needs, with the existing contact
+        # joined, then INSERT the whole batch at once - the per-lead loop
+        # cost 2 queries per selected row.
+        queryset = queryset.select_related('whatsapp_contact').only(
+            'id', 'phone', 'phone_normalized', 'title', 'category', 'whatsapp_contact__id'
+        )
+
+        leads = list(queryset)
+        created = WhatsAppContact.bulk_create_from_leads(leads)
+        skipped = len(leads) - created
+
         if created:
             messages.success(request, f'✅ Created {created} WhatsApp contacts')
         if skipped:
             messages.info(request, f'⏭️ Skipped {skipped} leads (not WhatsApp or already extracted)')
-        if errors:
-            messages.error(request, f'❌ {errors} errors occurred')
 
 
 @admin.register(WhatsAppContact)
@@ -523,8 +613,8 @@ class WhatsAppContactAdmin(admin.ModelAdmin):
     
     def lead_link(self, obj):
         """Link to original lead."""
-        if obj.lead:
-            url = reverse('admin:gmaps_leads_gmapslead_change', args=[obj.lead.pk])
+        if obj.lead_id:
+            url = _admin_url_template('admin:gmaps_leads_gmapslead_change').format(obj.lead_id)
             return format_html('<a href="{}">View Lead</a>', url)
         return '-'
     lead_link.short_description = 'Lead'
@@ -543,8 +633,11 @@ class WhatsAppContactAdmin(admin.ModelAdmin):
     
     @admin.action(description='📋 Export Chat IDs (copy to clipboard)')
     def export_chat_ids(self, request, queryset):
-        chat_ids = list(queryset.values_list('chat_id', flat=True))
-        messages.info(request, f'Chat IDs ({len(chat_ids)}): {", ".join(chat_ids[:10])}{"..." if len(chat_ids) > 10 else ""}')
+        # Only the count and first 10 IDs are shown - COUNT(*) plus a
+        # LIMIT 10 fetch instead of materializing the whole selection
+        total = queryset.count()
+        preview = list(queryset.values_list('chat_id', flat=True)[:10])
+        messages.info(request, f'Chat IDs ({total}): {", ".join(preview)}{"..." if total > 10 else ""}')
 
 
 # ===== LEAD WEBSITE ADMIN =====
@@ -561,9 +654,12 @@ class HasEmailsFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'yes':
+        val = self.value()
+        if val is None:
+            return queryset
+        if val == 'yes':
             return queryset.filter(emails_count__gt=0)
-        elif self.value() == 'no':
+        elif val == 'no':
             return queryset.filter(emails_count=0)
         return queryset
 
@@ -580,9 +676,12 @@ class AIProcessedFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'yes':
+        val = self.value()
+        if val is None:
+            return queryset
+        if val == 'yes':
             return queryset.exclude(ai_processed_at__isnull=True)
-        elif self.value() == 'no':
+        elif val == 'no':
             return queryset.filter(ai_processed_at__isnull=True)
         return queryset
 
@@ -605,8 +704,10 @@ class LeadWebsiteAdmin(admin.ModelAdmin):
         'scraped_at', 'created_at', 'updated_at'
     ]
     list_per_page = 50
+    # business_name/lead_link read obj.lead per row - join it up front
+    list_select_related = ('lead',)
     actions = ['scrape_selected', 'rescrape_selected', 'export_emails']
-    
+
     fieldsets = (
         ('Lead Info', {
             'fields': ('lead', 'url', 'final_url', 'status', 'error_message', 'http_status_code')
@@ -638,29 +739,41 @@ class LeadWebsiteAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Covers non-changelist consumers too (actions, autocomplete);
+        # list_select_related only applies to the changelist itself.
+        qs = super().get_queryset(request).select_related('lead')
+        match = request.resolver_match
+        if match and match.url_name == 'gmaps_leads_leadwebsite_changelist':
+            # The list page shows none of the heavy blobs (full_text stays
+            # loaded for content_preview); the default SELECT shipped
+            # multi-MB raw_html/JSON columns for all 50 rows.
+            qs = qs.defer(
+                'raw_html', 'headings', 'paragraphs', 'navigation_links',
+                'footer_content', 'meta_description', 'meta_keywords',
+                'phone_numbers', 'addresses', 'ai_summary', 'ai_services',
+                'ai_keywords',
+            )
+        return qs
+
     def business_name(self, obj):
         return obj.lead.title[:50]
     business_name.short_description = 'Business'
     business_name.admin_order_field = 'lead__title'
     
     def status_badge(self, obj):
-        colors = {
-            'pending': '#ffc107',
-            'scraping': '#17a2b8',
-            'completed': '#28a745',
-            'failed': '#dc3545',
-            'no_content': '#6c757d',
-        }
-        color = colors.get(obj.status, '#6c757d')
+        badge = _WEBSITE_STATUS_BADGES.get(obj.status)
+        if badge is not None:
+            return badge
         return format_html(
-            '<span style="background-color: {}; color: white; padding: 2px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color, obj.status.upper()
+            '<span style="background-color: #6c757d; color: white; padding: 2px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
+            obj.status.upper()
         )
     status_badge.short_description = 'Status'
     
     def emails_display(self, obj):
         if obj.emails_count == 0:
-            return format_html('<span style="color: #999;">—</span>')
+            return _EMPTY_DASH
         
         emails = obj.emails[:3] if isinstance(obj.emails, list) else []
         emails_str = ', '.join(emails)
@@ -675,7 +788,7 @@ class LeadWebsiteAdmin(admin.ModelAdmin):
     
     def content_preview(self, obj):
         if not obj.full_text:
-            return format_html('<span style="color: #999;">—</span>')
+            return _EMPTY_DASH
         
         preview = obj.full_text[:100] + '...' if len(obj.full_text) > 100 else obj.full_text
         return format_html(
@@ -687,28 +800,19 @@ class LeadWebsiteAdmin(admin.ModelAdmin):
     def social_icons(self, obj):
         if not obj.social_links:
             return '-'
-        
-        icons = {
-            'facebook': '📘',
-            'twitter': '🐦',
-            'instagram': '📷',
-            'linkedin': '💼',
-            'youtube': '📺',
-            'tiktok': '🎵',
-            'whatsapp': '💬',
-        }
-        
-        result = []
-        for platform, url in obj.social_links.items():
-            icon = icons.get(platform, '🔗')
-            result.append(format_html('<a href="{}" target="_blank" title="{}">{}</a>', url, platform, icon))
-        
-        return format_html(' '.join([str(r) for r in result]))
+
+        # Single-pass join; re-wrapping str()-coerced SafeStrings in
+        # format_html escaped them a second time and tripled allocations
+        return format_html_join(
+            ' ',
+            '<a href="{}" target="_blank" title="{}">{}</a>',
+            ((url, platform, _SOCIAL_ICONS.get(platform, '🔗')) for platform, url in obj.social_links.items()),
+        )
     social_icons.short_description = 'Social'
     
     def lead_link(self, obj):
-        if obj.lead:
-            url = reverse('admin:gmaps_leads_gmapslead_change', args=[obj.lead.pk])
+        if obj.lead_id:
+            url = _admin_url_template('admin:gmaps_leads_gmapslead_change').format(obj.lead_id)
             return format_html('<a href="{}">View Lead</a>', url)
         return '-'
     lead_link.short_description = 'Lead'
@@ -744,52 +848,52 @@ class LeadWebsiteAdmin(admin.ModelAdmin):
         )
     full_text_preview.short_description = 'Full Text Preview'
     
-    @admin.action(description='🌐 Scrape selected websites')
-    def scrape_selected(self, request, queryset):
+    def _scrape_batch(self, queryset, force):
+        """
+        Scrape the selected websites concurrently. Each call is an outbound
+        HTTP fetch, so running them serially made the action N x RTT;
+        threads overlap the socket waits.
+        """
         from .website_scraper import scrape_lead_website
-        
-        scraped = 0
-        errors = 0
-        
-        for website in queryset:
+
+        def scrape(website):
             try:
-                result = scrape_lead_website(website.lead, force=False)
-                if result and result.status == 'completed':
-                    scraped += 1
-                else:
-                    errors += 1
-            except Exception as e:
-                errors += 1
-        
+                result = scrape_lead_website(website.lead, force=force)
+                return bool(result and result.status == 'completed')
+            except Exception:
+                return False
+            finally:
+                # Each worker thread opened its own DB connection
+                connection.close()
+
+        # Fetch the leads in the main thread's single query; otherwise
+        # every worker lazily loads website.lead on its own connection
+        websites = list(queryset.select_related('lead'))
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(scrape, websites))
+
+        scraped = sum(results)
+        return scraped, len(results) - scraped
+
+    @admin.action(description='🌐 Scrape selected websites')
+    def scrape_selected(self, request, queryset):
+        scraped, errors = self._scrape_batch(queryset, force=False)
         messages.success(request, f'Scraped {scraped} websites ({errors} errors)')
-    
+
     @admin.action(description='🔄 Re-scrape selected websites')
     def rescrape_selected(self, request, queryset):
-        from .website_scraper import scrape_lead_website
-        
-        scraped = 0
-        errors = 0
-        
-        for website in queryset:
-            try:
-                result = scrape_lead_website(website.lead, force=True)
-                if result and result.status == 'completed':
-                    scraped += 1
-                else:
-                    errors += 1
-            except Exception as e:
-                errors += 1
-        
+        scraped, errors = self._scrape_batch(queryset, force=True)
         messages.success(request, f'Re-scraped {scraped} websites ({errors} errors)')
     
     @admin.action(description='📧 Export emails from selected')
     def export_emails(self, request, queryset):
-        all_emails = []
-        for website in queryset:
-            if website.emails:
-                all_emails.extend(website.emails)
-        
-        unique_emails = sorted(set(all_emails))
+        # Ship only the emails column - iterating the queryset would
+        # instantiate full LeadWebsite objects (raw_html included) per row
+        unique_emails = set()
+        email_lists = queryset.filter(emails_count__gt=0).values_list('emails', flat=True)
+        for emails in email_lists.iterator(chunk_size=2000):
+            unique_emails.update(emails)
+        unique_emails = sorted(unique_emails)
         
         if unique_emails:
             messages.info(request, f'Emails ({len(unique_emails)}): {", ".join(unique_emails[:20])}{"..." if len(unique_emails) > 20 else ""}')
@@ -836,43 +940,38 @@ class HasTargetEmailFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == 'yes':
+        # lead.has_contactable_email is a denormalized, indexed boolean
+        # kept in sync by LeadWebsite.save(); the old emails__len lookup
+        # ran a JSON length function per row and could not use an index.
+        val = self.value()
+        if val is None:
+            return queryset
+        if val == 'yes':
             # Has explicit recipient OR lead has website with emails
             return queryset.filter(
-                Q(recipient_email__isnull=False) & ~Q(recipient_email='')
-            ) | queryset.filter(
-                lead__website_data__emails__len__gt=0
+                Q(recipient_email__gt='') | Q(lead__has_contactable_email=True)
             )
-        elif self.value() == 'no':
+        elif val == 'no':
             return queryset.filter(
                 Q(recipient_email__isnull=True) | Q(recipient_email='')
-            ).exclude(
-                lead__website_data__emails__len__gt=0
-            )
+            ).filter(lead__has_contactable_email=False)
         return queryset
 
 
-from django import forms
-from ckeditor.widgets import CKEditorWidget
-
-class CustomizedContactAdminForm(forms.ModelForm):
-    class Meta:
-        model = CustomizedContact
-        fields = '__all__'
-        widgets = {
-            'body_html': CKEditorWidget(),
-        }
-
 @admin.register(CustomizedContact)
 class CustomizedContactAdmin(admin.ModelAdmin):
-    form = CustomizedContactAdminForm
     raw_id_fields = ['lead']
+    # The lead column renders lead.title per row; join it once
+    list_select_related = ('lead',)
     readonly_fields = ['body_plain_display', 'created_at', 'updated_at']
     list_display = [
         'lead', 'subject', 'template_type', 'status', 'recipient_email', 'created_at', 'updated_at'
     ]
-    list_filter = [CustomizedContactTypeFilter, 'status', 'created_at', 'updated_at']
+    list_filter = [CustomizedContactTypeFilter, HasTargetEmailFilter, 'status', 'created_at', 'updated_at']
     search_fields = ['lead__title', 'subject', 'body_html', 'body_plain', 'recipient_email']
+    list_per_page = 50
+    # Skip the unfiltered COUNT(*) the changelist otherwise runs per page
+    show_full_result_count = False
 
     fieldsets = (
         ('Lead & Content Info', {
@@ -889,10 +988,30 @@ class CustomizedContactAdmin(admin.ModelAdmin):
         }),
     )
 
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        # Rich-text editing is only wanted for the HTML body; giving every
+        # TextField a CKEditorWidget would ship the editor payload per field
+        if db_field.name == 'body_html':
+            kwargs['widget'] = CKEditorWidget()
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+    def get_queryset(self, request):
+        # lead (changelist column, __str__ reads lead.title), the export
+        # action and lead_context_preview all touch obj.lead - and the
+        # preview follows through to lead.website_data. One JOIN instead of
+        # up to two queries per row.
+        qs = super().get_queryset(request).select_related('lead', 'lead__website_data')
+        match = request.resolver_match
+        if match and match.url_name == 'gmaps_leads_customizedcontact_changelist':
+            # The list columns never show the bodies; these two TEXT
+            # fields dominate row bytes
+            qs = qs.defer('body_html', 'body_plain')
+        return qs
+
     def body_plain_display(self, obj):
         """Show WhatsApp-friendly message generated from HTML."""
         if not obj or not obj.body_plain:
-            return format_html('<span style="color:#999;">No WhatsApp message generated yet.</span>')
+            return _NO_BODY_PLAIN
         return format_html(
             '<pre style="white-space: pre-wrap; background: #f8f9fa; padding: 8px; border-radius: 4px;">{}</pre>',
             obj.body_plain
@@ -909,51 +1028,56 @@ class CustomizedContactAdmin(admin.ModelAdmin):
         """Show lead context that would be sent to AI."""
         if not obj.lead:
             return '-'
-        
-        context_parts = [
-            f"<strong>Business:</strong> {obj.lead.title}",
-            f"<strong>Category:</strong> {obj.lead.category or 'N/A'}",
-            f"<strong>Phone:</strong> {obj.lead.phone or 'N/A'}",
-            f"<strong>Website:</strong> {obj.lead.website or 'N/A'}",
+
+        rows = [
+            ('Business', obj.lead.title),
+            ('Category', obj.lead.category or 'N/A'),
+            ('Phone', obj.lead.phone or 'N/A'),
+            ('Website', obj.lead.website or 'N/A'),
         ]
-        
+
         # Add website data if available
-        try:
-            if hasattr(obj.lead, 'website_data') and obj.lead.website_data:
-                wd = obj.lead.website_data
-                if wd.emails:
-                    context_parts.append(f"<strong>Emails:</strong> {', '.join(wd.emails)}")
-                if wd.ai_services:
-                    context_parts.append(f"<strong>Services:</strong> {', '.join(wd.ai_services[:5])}")
-        except:
-            pass
-        
-        return format_html('<br>'.join(context_parts))
+        website_data = getattr(obj.lead, 'website_data', None)
+        if website_data:
+            if website_data.emails:
+                rows.append(('Emails', ', '.join(website_data.emails[:10])))
+            if website_data.ai_services:
+                rows.append(('Services', ', '.join(website_data.ai_services[:5])))
+
+        # format_html_join escapes each value individually; the old
+        # f-string build interpolated lead fields unescaped and then ran
+        # format_html over the whole concatenated blob.
+        return format_html_join(mark_safe('<br>'), '<strong>{}:</strong> {}', rows)
     lead_context_preview.short_description = 'Lead Context'
     
     # Actions
+    def _bulk_set_status(self, queryset, status, signal):
+        """
+        One UPDATE for the whole selection instead of a save() per row,
+        then fan the custom signal out over the already-loaded instances.
+        """
+        from django.utils import timezone
+        pending = list(queryset.exclude(status=status))
+        if not pending:
+            return 0
+        CustomizedContact.objects.filter(pk__in=[t.pk for t in pending]).update(
+            status=status, updated_at=timezone.now()
+        )
+        for template in pending:
+            template.status = status
+            signal.send(sender=self.__class__, instance=template)
+        return len(pending)
+
     @admin.action(description='✅ Mark as Ready to Send')
     def mark_as_ready(self, request, queryset):
         from .signals import email_template_ready
-        updated = 0
-        for template in queryset:
-            if template.status != 'ready':
-                template.status = 'ready'
-                template.save()
-                email_template_ready.send(sender=self.__class__, instance=template)
-                updated += 1
+        updated = self._bulk_set_status(queryset, 'ready', email_template_ready)
         messages.success(request, f'Marked {updated} templates as ready (signals emitted)')
-    
+
     @admin.action(description='👍 Mark as Approved')
     def mark_as_approved(self, request, queryset):
         from .signals import email_template_approved
-        updated = 0
-        for template in queryset:
-            if template.status != 'approved':
-                template.status = 'approved'
-                template.save()
-                email_template_approved.send(sender=self.__class__, instance=template)
-                updated += 1
+        updated = self._bulk_set_status(queryset, 'approved', email_template_approved)
         messages.success(request, f'Approved {updated} templates (signals emitted)')
     
     @admin.action(description='📝 Mark as Draft')
@@ -969,38 +1093,51 @@ class CustomizedContactAdmin(admin.ModelAdmin):
     @admin.action(description='📋 Export for Sending (CSV)')
     def export_for_sending(self, request, queryset):
         import csv
-        from django.http import HttpResponse
-        
-        # Only export ready/approved templates with target emails
-        templates = queryset.filter(status__in=['ready', 'approved'])
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="email_templates_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Lead ID', 'Business Name', 'Target Email', 'Subject', 
-            'Body HTML', 'Body Plain', 'Status', 'Template Type'
-        ])
-        
-        exported = 0
-        for template in templates:
-            target = template.target_email
-            if target:
-                writer.writerow([
-                    template.lead_id,
-                    template.lead.title,
-                    target,
-                    template.subject,
-                    template.body_html,
-                    template.body_plain or '',
-                    template.status,
-                    template.template_type,
-                ])
-                exported += 1
-        
-        if exported == 0:
+
+        # Only export ready/approved templates with target emails. values()
+        # returns plain dicts with exactly the written columns - no model
+        # (or joined lead) instantiation per row.
+        rows_qs = queryset.filter(status__in=['ready', 'approved']).values(
+            'lead_id', 'lead__title', 'recipient_email',
+            'lead__website_data__emails', 'subject', 'body_html',
+            'body_plain', 'status', 'template_type',
+        )
+
+        if not rows_qs.exists():
             messages.warning(request, 'No templates with target emails to export')
             return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/admin/'))
-        
+
+        class Echo:
+            """File-like whose write() just hands the row back to the generator."""
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Echo())
+
+        def rows():
+            yield writer.writerow([
+                'Lead ID', 'Business Name', 'Target Email', 'Subject',
+                'Body HTML', 'Body Plain', 'Status', 'Template Type'
+            ])
+            # iterator() keeps memory flat; body_html can be large and the
+            # old version buffered the entire CSV into one response
+            for row in rows_qs.iterator(chunk_size=2000):
+                # Same resolution as CustomizedContact.target_email
+                emails = row['lead__website_data__emails']
+                target = row['recipient_email'] or (emails[0] if emails else None)
+                if not target:
+                    continue
+                yield writer.writerow([
+                    row['lead_id'],
+                    row['lead__title'],
+                    target,
+                    row['subject'],
+                    row['body_html'],
+                    row['body_plain'] or '',
+                    row['status'],
+                    row['template_type'],
+                ])
+
+        response = StreamingHttpResponse(rows(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="email_templates_export.csv"'
         return response
@@ -16,7 +16,7 @@ Usage:
 """
 import logging
 from django.core.management.base import BaseCommand
-from django.db import IntegrityError
+from django.db.models import Count, Q
 
 from gmaps_leads.models import GmapsLead, WhatsAppContact, ScrapeJob
 
@@ -58,63 +58,81 @@ class Command(BaseCommand):
         leads = GmapsLead.objects.all()
         if job_id:
             leads = leads.filter(job_id=job_id)
-        
-        total_leads = leads.count()
-        
-        # Classify all leads by phone type
-        whatsapp_leads = []
-        local_leads = []
-        other_leads = []
-        no_phone_leads = []
-        
-        for lead in leads:
-            phone_type = lead.phone_type
-            if phone_type == 'whatsapp':
-                whatsapp_leads.append(lead)
-            elif phone_type == 'local':
-                local_leads.append(lead)
-            elif phone_type == 'other':
-                other_leads.append(lead)
-            else:
-                no_phone_leads.append(lead)
-        
-        # Print statistics
-        self.stdout.write('')
-        self.stdout.write('=' * 60)
-        self.stdout.write('PHONE NUMBER STATISTICS')
-        self.stdout.write('=' * 60)
-        self.stdout.write(f'  Total leads:              {total_leads:>8}')
-        self.stdout.write(f'  WhatsApp (905XX):         {len(whatsapp_leads):>8}  ({len(whatsapp_leads)/total_leads*100:.1f}%)' if total_leads else f'  WhatsApp (905XX):         {len(whatsapp_leads):>8}')
-        self.stdout.write(f'  Local landlines (902XX):  {len(local_leads):>8}  ({len(local_leads)/total_leads*100:.1f}%)' if total_leads else f'  Local landlines (902XX):  {len(local_leads):>8}')
-        self.stdout.write(f'  Other numbers:            {len(other_leads):>8}  ({len(other_leads)/total_leads*100:.1f}%)' if total_leads else f'  Other numbers:            {len(other_leads):>8}')
-        self.stdout.write(f'  No phone:                 {len(no_phone_leads):>8}  ({len(no_phone_leads)/total_leads*100:.1f}%)' if total_leads else f'  No phone:                 {len(no_phone_leads):>8}')
-        self.stdout.write('=' * 60)
-        
-        # Website statistics
-        with_website = leads.exclude(website__isnull=True).exclude(website='').count()
+
+        # Classify in SQL: the DB returns four integers instead of every
+        # lead being instantiated in Python just to read phone_type
+        stats = leads.aggregate(
+            total=Count('id'),
+            whatsapp=Count('id', filter=Q(phone_normalized__startswith='905')),
+            local=Count('id', filter=(
+                Q(phone_normalized__startswith='902') |
+                Q(phone_normalized__startswith='903') |
+                Q(phone_normalized__startswith='904')
+            )),
+            no_phone=Count('id', filter=Q(phone_normalized='')),
+            with_website=Count('id', filter=~(Q(website__isnull=True) | Q(website=''))),
+        )
+        total_leads = stats['total']
+        whatsapp_count = stats['whatsapp']
+        local_count = stats['local']
+        no_phone_count = stats['no_phone']
+        other_count = total_leads - whatsapp_count - local_count - no_phone_count
+
+        def pct(count):
+            return f'  ({count / total_leads * 100:.1f}%)' if total_leads else ''
+
+        # Website statistics (from the same aggregate round-trip)
+        with_website = stats['with_website']
         without_website = total_leads - with_website
-        self.stdout.write('')
-        self.stdout.write('WEBSITE STATISTICS')
-        self.stdout.write('=' * 60)
-        self.stdout.write(f'  With website:             {with_website:>8}  ({with_website/total_leads*100:.1f}%)' if total_leads else f'  With website:             {with_website:>8}')
-        self.stdout.write(f'  Without website:          {without_website:>8}  ({without_website/total_leads*100:.1f}%)' if total_leads else f'  Without website:          {without_website:>8}')
-        self.stdout.write('=' * 60)
+
+        # One write for the whole report instead of ~15 OutputWrapper
+        # round-trips (style + flush per line)
+        rule = '=' * 60
+        report = '\n'.join([
+            '',
+            rule,
+            'PHONE NUMBER STATISTICS',
+            rule,
+            f'  Total leads:              {total_leads:>8}',
+            f'  WhatsApp (905XX):         {whatsapp_count:>8}{pct(whatsapp_count)}',
+            f'  Local landlines (902XX):  {local_count:>8}{pct(local_count)}',
+            f'  Other numbers:            {other_count:>8}{pct(other_count)}',
+            f'  No phone:                 {no_phone_count:>8}{pct(no_phone_count)}',
+            rule,
+            '',
+            'WEBSITE STATISTICS',
+            rule,
+            f'  With website:             {with_website:>8}{pct(with_website)}',
+            f'  Without website:          {without_website:>8}{pct(without_website)}',
+            rule,
+            '',
+        ])
+        self.stdout.write(report, ending='')
         
         if stats_only:
             return
         
         # Check existing WhatsApp contacts
         existing_contacts = WhatsAppContact.objects.count()
-        existing_lead_ids = set(WhatsAppContact.objects.values_list('lead_id', flat=True))
-        
+
         self.stdout.write('')
         self.stdout.write(f'Existing WhatsApp contacts: {existing_contacts}')
-        
-        # Filter leads that need processing
-        if force:
-            leads_to_process = whatsapp_leads
-        else:
-            leads_to_process = [l for l in whatsapp_leads if l.id not in existing_lead_ids]
+
+        # Only materialize the WhatsApp candidates, restricted to the
+        # columns extraction actually needs. phone_type keeps the length
+        # check the prefix filter cannot express.
+        whatsapp_qs = leads.filter(phone_normalized__startswith='905').only(
+            'id', 'phone', 'phone_normalized', 'title', 'category'
+        )
+        if not force:
+            # Anti-join in SQL; the old version materialized every
+            # candidate and probed a Python set of all contact lead ids
+            whatsapp_qs = whatsapp_qs.exclude(id__in=WhatsAppContact.objects.values('lead_id'))
+
+        leads_to_process = [
+            l for l in whatsapp_qs.iterator(chunk_size=1000)
+            if l.phone_type == 'whatsapp'
+        ]
         
         self.stdout.write(f'Leads to process:           {len(leads_to_process)}')
         
@@ -135,33 +153,52 @@ class Command(BaseCommand):
         self.stdout.write('')
         self.stdout.write('Extracting WhatsApp contacts...')
         
-        created = 0
-        updated = 0
         errors = 0
-        
+
+        # Existing contacts for the --force refresh path, fetched in one go
+        if force:
+            existing = {
+                c.lead_id: c
+                for c in WhatsAppContact.objects.filter(
+                    lead_id__in=[l.id for l in leads_to_process]
+                )
+            }
+        else:
+            existing = {}
+
+        to_create = []
+        to_update = []
+
         for lead in leads_to_process:
             try:
-                if force and lead.id in existing_lead_ids:
-                    # Update existing
-                    contact = WhatsAppContact.objects.get(lead=lead)
+                contact = existing.get(lead.id)
+                if contact is not None:
+                    # Refresh existing contact from the lead
                     phone = lead.cleaned_phone
                     contact.phone_number = phone
                     contact.chat_id = f"{phone}@c.us"
                     contact.jid = f"{phone}@s.whatsapp.net"
                     contact.business_name = lead.title
                     contact.category = lead.category
-                    contact.save()
-                    updated += 1
+                    to_update.append(contact)
                 else:
-                    # Create new
-                    WhatsAppContact.create_from_lead(lead)
-                    created += 1
-            except IntegrityError:
-                # Already exists
-                pass
+                    to_create.append(WhatsAppContact.build_from_lead(lead))
             except Exception as e:
                 errors += 1
                 self.stdout.write(self.style.ERROR(f'  Error for {lead.title}: {e}'))
+
+        # One INSERT/UPDATE statement per batch instead of per contact;
+        # ignore_conflicts covers races with the admin extraction action
+        created = len(WhatsAppContact.objects.bulk_create(
+            to_create, batch_size=1000, ignore_conflicts=True
+        ))
+        updated = len(to_update)
+        if to_update:
+            WhatsAppContact.objects.bulk_update(
+                to_update,
+                ['phone_number', 'chat_id', 'jid', 'business_name', 'category'],
+                batch_size=1000,
+            )
         
         # Summary
         self.stdout.write('')
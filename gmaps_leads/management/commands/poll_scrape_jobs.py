@@ -15,9 +15,16 @@ Usage:
     */5 * * * * cd /path/to/project && python manage.py poll_scrape_jobs
 """
 import csv
+import re
+import signal
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import orjson
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -29,6 +36,57 @@ from gmaps_leads.services import (
 
 logger = logging.getLogger(__name__)
 
+# Field length limits from model
+FIELD_LIMITS = {
+    'title': 500,
+    'link': 2000,
+    'category': 255,
+    'phone': 50,
+    'website': 2000,
+    'plus_code': 100,
+    'timezone': 100,
+    'reviews_link': 2000,
+    'thumbnail': 2000,
+    'status': 100,
+    'price_range': 50,
+    'cid': 100,
+    'data_id': 100,
+    'input_id': 255,
+}
+
+NUMERIC_FIELDS = ['review_count', 'latitude', 'longitude', 'review_rating']
+
+# Fixed-shape iteration target for the per-row loop (no dict-view
+# rebuild per row)
+_FIELD_LIMIT_ITEMS = tuple(FIELD_LIMITS.items())
+
+# Fast-accept patterns for numeric cells: a match is definitely parseable,
+# so int()/float() (and their raised-and-caught ValueErrors on bad data)
+# only run on the rare values the regex rejects
+_INT_RE = re.compile(r'^[+-]?\d+$')
+_NUM_RE = re.compile(r'^-?\d+(\.\d+)?([eE][-+]?\d+)?$')
+
+JSON_FIELDS = [
+    'open_hours', 'popular_times', 'reviews_per_rating',
+    'user_reviews', 'user_reviews_extended', 'images',
+    'complete_address', 'about', 'reservations',
+    'order_online', 'menu', 'owner',
+]
+
+
+@lru_cache(maxsize=8192)
+def _json_ok(value):
+    """
+    Whether a cell parses as JSON. Memoized because scrape exports repeat
+    the same payloads (template open_hours etc.) across many rows, so
+    duplicates skip the reparse.
+    """
+    try:
+        orjson.loads(value)
+        return True
+    except Exception:
+        return False
+
 
 class Command(BaseCommand):
     help = 'Poll for completed scrape jobs and import results'
@@ -66,6 +124,16 @@ class Command(BaseCommand):
             default=600,  # 10 minutes - safe window for cron
             help='Minimum job age in seconds before checking (default: 600 = 10 minutes)',
         )
+        parser.add_argument(
+            '--slow-validate',
+            action='store_true',
+            help='Use the row-by-row CSV validator instead of the vectorized one (debugging)',
+        )
+        parser.add_argument(
+            '--use-copy',
+            action='store_true',
+            help='Insert leads with Postgres COPY (falls back to bulk_create on other backends)',
+        )
 
     def handle(self, *args, **options):
         daemon_mode = options['daemon']
@@ -74,6 +142,8 @@ class Command(BaseCommand):
         external_id = options['external_id']
         interval = options['interval']
         min_age_seconds = options['min_age']
+        self.slow_validate = options['slow_validate']
+        self.use_copy = options['use_copy']
         
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be imported'))
@@ -98,48 +168,114 @@ class Command(BaseCommand):
         
         if daemon_mode:
             self.stdout.write(f'Starting daemon mode, polling every {interval} seconds...')
-            while True:
-                self._poll_jobs(min_age_seconds, dry_run=dry_run)
-                time.sleep(interval)
+            self._run_daemon(interval, min_age_seconds, dry_run)
         else:
             self._poll_jobs(min_age_seconds, dry_run=dry_run)
-    
+
+    def _run_daemon(self, interval, min_age_seconds, dry_run):
+        """
+        Fixed-phase polling loop. The next wake-up is scheduled interval
+        seconds from the previous one, not from poll completion, so a slow
+        poll does not drift the schedule. SIGTERM finishes the current poll
+        and exits cleanly.
+        """
+        stopping = []
+
+        def request_stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, request_stop)
+
+        next_wake = time.monotonic()
+        while not stopping:
+            self._poll_jobs(min_age_seconds, dry_run=dry_run)
+            next_wake += interval
+            # Sleep in short slices so SIGTERM mid-wait exits promptly
+            while not stopping:
+                remaining = next_wake - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, 1.0))
+        self.stdout.write('Received SIGTERM, shutting down.')
+
     def _poll_jobs(self, min_age_seconds, dry_run=False):
         """Check pending jobs and import completed ones."""
-        min_age = timezone.now() - timedelta(seconds=min_age_seconds)
-        
-        # Find jobs that need checking
-        pending_jobs = ScrapeJob.objects.filter(
-            status__in=['pending', 'running'],
-            created_at__lte=min_age
-        )
-        
-        count = pending_jobs.count()
-        if count == 0:
-            self.stdout.write('No pending jobs to check.')
-            return
-        
-        self.stdout.write(f'Checking {count} pending job(s)...')
-        
-        for job in pending_jobs:
-            self._process_job(job, dry_run=dry_run)
-    
-    def _process_job(self, job, dry_run=False):
+        now = timezone.now()
+        min_age = now - timedelta(seconds=min_age_seconds)
+
+        # Find jobs that need checking. Claiming the rows with
+        # skip_locked means overlapping cron invocations each grab a
+        # disjoint set instead of double-importing the same job; the rows
+        # must be locked (and therefore materialized) inside the
+        # transaction, which is fine for a job table.
+        with transaction.atomic():
+            pending_jobs = ScrapeJob.objects.filter(
+                status__in=['pending', 'running'],
+                created_at__lte=min_age
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                pending_jobs = pending_jobs.select_for_update(skip_locked=True)
+            pending_jobs = list(pending_jobs)
+
+            count = len(pending_jobs)
+            if count == 0:
+                self.stdout.write('No pending jobs to check.')
+                return
+
+            self.stdout.write(f'Checking {count} pending job(s)...')
+
+            # One jobs-list call instead of a status GET per pending job;
+            # any job missing from the listing falls back to its own request
+            service = GmapsScraperService()
+            api_jobs = {}
+            for api_job in service.get_all_jobs():
+                api_id = api_job.get('ID') or api_job.get('id')
+                if api_id:
+                    api_jobs[api_id] = api_job
+
+            # Jobs the API already reports as completed will need their
+            # CSV; start those downloads on a small pool so job N+1's
+            # download overlaps job N's validation/import on this thread
+            to_download = [
+                job for job in pending_jobs
+                if job.leads_count == 0
+                and job.external_id in api_jobs
+                and service.map_job_status(api_jobs[job.external_id])[0]
+            ]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                csv_futures = {
+                    job.external_id: pool.submit(service.download_csv_to_file, job.external_id)
+                    for job in to_download
+                }
+                for job in pending_jobs:
+                    future = csv_futures.get(job.external_id)
+                    self._process_job(
+                        job,
+                        dry_run=dry_run,
+                        api_data=api_jobs.get(job.external_id),
+                        csv_path=future.result() if future else None,
+                        now=now,
+                    )
+
+    def _process_job(self, job, dry_run=False, api_data=None, csv_path=None, now=None):
         """Process a single job: refresh status and import if ready."""
         self.stdout.write(f'\n  Checking job: {job.name} ({job.external_id})')
-        
+
         try:
             # Refresh status from API
-            job = refresh_job_status(job)
+            job = refresh_job_status(job, api_data=api_data)
             self.stdout.write(f'    Status: {job.status}')
-            
+
             # If completed and no leads imported yet, import them
             if job.status == 'completed' and job.leads_count == 0:
                 if dry_run:
-                    self._dry_run_import(job)
+                    self._dry_run_import(job, csv_path=csv_path)
                 else:
                     self.stdout.write(f'    Importing results...')
-                    count = import_job_results(job)
+                    count = import_job_results(
+                        job, csv_path=csv_path,
+                        use_copy=getattr(self, 'use_copy', False),
+                    )
                     self.stdout.write(
                         self.style.SUCCESS(f'    Imported {count} leads!')
                     )
@@ -148,8 +284,9 @@ class Command(BaseCommand):
                     self.style.ERROR(f'    Job failed: {job.error_message}')
                 )
             elif job.status in ['pending', 'running']:
-                # Calculate time since creation
-                age = timezone.now() - job.created_at
+                # Calculate time since creation; the poll loop passes its
+                # timestamp in so a poll cycle only allocates one now()
+                age = (now or timezone.now()) - job.created_at
                 self.stdout.write(f'    Still processing (age: {age})')
                 
         except Exception as e:
@@ -158,107 +295,33 @@ class Command(BaseCommand):
             )
             logger.exception(f'Error processing job {job.external_id}')
     
-    def _dry_run_import(self, job):
+    def _dry_run_import(self, job, csv_path=None):
         """Validate CSV data without importing."""
         self.stdout.write(self.style.WARNING(f'    [DRY RUN] Validating CSV...'))
-        
-        service = GmapsScraperService()
-        
-        # Check if ready
-        is_ready, status = service.is_job_ready(job.external_id)
-        if not is_ready:
-            self.stdout.write(self.style.ERROR(f'    Job not ready: {status}'))
-            return
-        
-        # Download CSV
-        csv_path = service.download_csv_to_file(job.external_id)
-        if not csv_path:
-            self.stdout.write(self.style.ERROR(f'    Failed to download CSV'))
-            return
-        
+
+        # Download the CSV unless the poll loop already prefetched it
+        if csv_path is None:
+            service = GmapsScraperService()
+
+            # Check if ready
+            is_ready, status = service.is_job_ready(job.external_id)
+            if not is_ready:
+                self.stdout.write(self.style.ERROR(f'    Job not ready: {status}'))
+                return
+
+            csv_path = service.download_csv_to_file(job.external_id)
+            if not csv_path:
+                self.stdout.write(self.style.ERROR(f'    Failed to download CSV'))
+                return
+
         self.stdout.write(f'    Downloaded CSV to: {csv_path}')
         
-        # Validate each row
-        errors = []
-        warnings = []
-        valid_rows = 0
-        total_rows = 0
-        
-        # Field length limits from model
-        field_limits = {
-            'title': 500,
-            'link': 2000,
-            'category': 255,
-            'phone': 50,
-            'website': 2000,
-            'plus_code': 100,
-            'timezone': 100,
-            'reviews_link': 2000,
-            'thumbnail': 2000,
-            'status': 100,
-            'price_range': 50,
-            'cid': 100,
-            'data_id': 100,
-            'input_id': 255,
-        }
-        
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # Check CSV headers
-                csv_fields = reader.fieldnames or []
-                self.stdout.write(f'    CSV columns ({len(csv_fields)}): {", ".join(csv_fields[:10])}...')
-                
-                for row_num, row in enumerate(reader, start=2):
-                    total_rows += 1
-                    row_errors = []
-                    row_warnings = []
-                    
-                    # Validate required field
-                    if not row.get('title'):
-                        row_errors.append('Missing required field: title')
-                    
-                    # Validate field lengths
-                    for field, max_len in field_limits.items():
-                        value = row.get(field, '')
-                        if value and len(value) > max_len:
-                            row_warnings.append(f'{field} too long ({len(value)} > {max_len}), will be truncated')
-                    
-                    # Validate numeric fields
-                    for field in ['review_count', 'latitude', 'longitude', 'review_rating']:
-                        value = row.get(field, '')
-                        if value:
-                            try:
-                                if field == 'review_count':
-                                    int(value)
-                                else:
-                                    float(value)
-                            except ValueError:
-                                row_errors.append(f'{field} is not a valid number: {value[:20]}')
-                    
-                    # Validate JSON fields
-                    json_fields = ['open_hours', 'popular_times', 'reviews_per_rating', 
-                                   'user_reviews', 'user_reviews_extended', 'images',
-                                   'complete_address', 'about', 'reservations', 
-                                   'order_online', 'menu', 'owner']
-                    for field in json_fields:
-                        value = row.get(field, '')
-                        if value and value not in ('{}', '[]', 'null', ''):
-                            try:
-                                import json
-                                json.loads(value)
-                            except:
-                                row_warnings.append(f'{field} has invalid JSON')
-                    
-                    if row_errors:
-                        errors.append(f'Row {row_num}: {"; ".join(row_errors)}')
-                    else:
-                        valid_rows += 1
-                    
-                    if row_warnings:
-                        warnings.extend([f'Row {row_num}: {w}' for w in row_warnings])
-            
+            if getattr(self, 'slow_validate', False):
+                total_rows, valid_rows, errors, warnings = self._validate_csv_slow(csv_path)
+            else:
+                total_rows, valid_rows, errors, warnings = self._validate_csv_fast(csv_path)
+
             # Print summary
             self.stdout.write('')
             self.stdout.write(f'    ╔══════════════════════════════════════╗')
@@ -298,3 +361,135 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'    Failed to validate CSV: {e}'))
             logger.exception('Dry run validation failed')
+
+    def _validate_csv_fast(self, csv_path):
+        """
+        Vectorized CSV validation: presence/length/numeric checks run
+        column-wise in pandas instead of per-cell Python; only JSON
+        parsing stays per cell, restricted to non-trivial values.
+        """
+        import pandas as pd
+
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        total_rows = len(df)
+
+        csv_fields = list(df.columns)
+        self.stdout.write(f'    CSV columns ({len(csv_fields)}): {", ".join(csv_fields[:10])}...')
+
+        row_errors = {}  # dataframe index -> [messages]
+        warnings = []
+
+        def add_error(idx, msg):
+            row_errors.setdefault(idx, []).append(msg)
+
+        # Validate required field
+        missing_title = df.index[df['title'] == ''] if 'title' in df.columns else df.index
+        for i in missing_title:
+            add_error(i, 'Missing required field: title')
+
+        # Validate field lengths
+        for field, max_len in FIELD_LIMITS.items():
+            if field not in df.columns:
+                continue
+            lengths = df[field].str.len()
+            for i in df.index[lengths > max_len]:
+                warnings.append(f'Row {i + 2}: {field} too long ({lengths[i]} > {max_len}), will be truncated')
+
+        # Validate numeric fields
+        for field in NUMERIC_FIELDS:
+            if field not in df.columns:
+                continue
+            col = df[field]
+            non_empty = col != ''
+            if field == 'review_count':
+                bad = non_empty & ~col.str.fullmatch(r'[+-]?\d+')
+            else:
+                bad = non_empty & pd.to_numeric(col.where(non_empty), errors='coerce').isna()
+            for i in df.index[bad]:
+                add_error(i, f'{field} is not a valid number: {col[i][:20]}')
+
+        # Validate JSON fields
+        for field in JSON_FIELDS:
+            if field not in df.columns:
+                continue
+            col = df[field]
+            for i, value in col[~col.isin(('', '{}', '[]', 'null'))].items():
+                if not _json_ok(value):
+                    warnings.append(f'Row {i + 2}: {field} has invalid JSON')
+
+        errors = [f'Row {i + 2}: {"; ".join(msgs)}' for i, msgs in sorted(row_errors.items())]
+        valid_rows = total_rows - len(row_errors)
+        return total_rows, valid_rows, errors, warnings
+
+    def _validate_csv_slow(self, csv_path):
+        """Row-by-row validation, kept for debugging via --slow-validate."""
+        errors = []
+        warnings = []
+        valid_rows = 0
+        total_rows = 0
+
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            # The schema is fixed, so plain csv.reader plus positional
+            # indexes avoids DictReader's per-row dict build and keyed
+            # lookups
+            reader = csv.reader(f)
+            csv_fields = next(reader, []) or []
+            self.stdout.write(f'    CSV columns ({len(csv_fields)}): {", ".join(csv_fields[:10])}...')
+
+            idx = {name: i for i, name in enumerate(csv_fields)}
+            n_cols = len(csv_fields)
+            title_i = idx.get('title')
+            limit_cols = [(idx[f], f, max_len) for f, max_len in _FIELD_LIMIT_ITEMS if f in idx]
+            numeric_cols = [(idx[f], f) for f in NUMERIC_FIELDS if f in idx]
+            json_cols = [(idx[f], f) for f in JSON_FIELDS if f in idx]
+
+            for row_num, row in enumerate(reader, start=2):
+                total_rows += 1
+                row_errors = []
+                row_warnings = []
+
+                # Short rows would miss trailing columns
+                if len(row) < n_cols:
+                    row = row + [''] * (n_cols - len(row))
+
+                # Validate required field
+                if title_i is None or not row[title_i]:
+                    row_errors.append('Missing required field: title')
+
+                # Validate field lengths
+                for i, field, max_len in limit_cols:
+                    value = row[i]
+                    if value and len(value) > max_len:
+                        row_warnings.append(f'{field} too long ({len(value)} > {max_len}), will be truncated')
+
+                # Validate numeric fields
+                for i, field in numeric_cols:
+                    value = row[i]
+                    if not value:
+                        continue
+                    if (_INT_RE if field == 'review_count' else _NUM_RE).match(value):
+                        continue
+                    try:
+                        if field == 'review_count':
+                            int(value)
+                        else:
+                            float(value)
+                    except ValueError:
+                        row_errors.append(f'{field} is not a valid number: {value[:20]}')
+
+                # Validate JSON fields
+                for i, field in json_cols:
+                    value = row[i]
+                    if value and value not in ('{}', '[]', 'null'):
+                        if not _json_ok(value):
+                            row_warnings.append(f'{field} has invalid JSON')
+
+                if row_errors:
+                    errors.append(f'Row {row_num}: {"; ".join(row_errors)}')
+                else:
+                    valid_rows += 1
+
+                if row_warnings:
+                    warnings.extend([f'Row {row_num}: {w}' for w in row_warnings])
+
+        return total_rows, valid_rows, errors, warnings
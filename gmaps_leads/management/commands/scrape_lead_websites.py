@@ -30,13 +30,17 @@ Usage:
     # Show statistics only
     python manage.py scrape_lead_websites --stats
 """
+import io
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 
 from gmaps_leads.models import GmapsLead, LeadWebsite
-from gmaps_leads.website_scraper import scrape_lead_website
+from gmaps_leads.website_scraper import SCRAPE_RESULT_FIELDS, build_lead_website
 
 logger = logging.getLogger(__name__)
 
@@ -79,8 +83,44 @@ class Command(BaseCommand):
             '--delay',
             type=float,
             default=1.0,
-            help='Delay between requests in seconds (default: 1.0)',
+            help='Delay after each request per worker in seconds (default: 1.0)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Number of concurrent scrape workers (default: 8)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of scraped websites to persist per flush (default: 1000)',
+        )
+
+    def _flush_websites(self, pending):
+        """
+        Upsert a batch of scraped LeadWebsite rows in one statement and
+        keep the denormalized email flag on the leads in sync (bulk_create
+        bypasses LeadWebsite.save(), which normally does this).
+        """
+        if not pending:
+            return
+        with transaction.atomic():
+            LeadWebsite.objects.bulk_create(
+                pending,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['lead'],
+                update_fields=SCRAPE_RESULT_FIELDS,
+            )
+            with_emails = [w.lead_id for w in pending if w.emails]
+            without_emails = [w.lead_id for w in pending if not w.emails]
+            if with_emails:
+                GmapsLead.objects.filter(pk__in=with_emails).update(has_contactable_email=True)
+            if without_emails:
+                GmapsLead.objects.filter(pk__in=without_emails).update(has_contactable_email=False)
+        pending.clear()
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
@@ -90,6 +130,8 @@ class Command(BaseCommand):
         limit = options['limit']
         stats_only = options['stats']
         delay = options['delay']
+        concurrency = max(options['concurrency'], 1)
+        batch_size = max(options['batch_size'], 1)
         
         # Build queryset
         leads = GmapsLead.objects.exclude(
@@ -102,15 +144,21 @@ class Command(BaseCommand):
         if lead_id:
             leads = leads.filter(pk=lead_id)
         
-        # Show statistics
-        total_with_website = leads.count()
-        already_scraped = LeadWebsite.objects.filter(lead__in=leads).count()
-        pending = total_with_website - already_scraped if not force else total_with_website
-        
-        with_emails = LeadWebsite.objects.filter(lead__in=leads, emails_count__gt=0).count()
-        total_emails = sum(
-            LeadWebsite.objects.filter(lead__in=leads).values_list('emails_count', flat=True)
+        # Show statistics. Materialize the lead ids once and answer the
+        # scraped/emails questions with one conditional aggregate instead
+        # of re-running the lead subquery per count.
+        lead_ids = list(leads.values_list('pk', flat=True))
+        total_with_website = len(lead_ids)
+        website_stats = LeadWebsite.objects.filter(lead_id__in=lead_ids).aggregate(
+            total=Count('id'),
+            with_emails=Count('id', filter=Q(emails_count__gt=0)),
+            emails_sum=Sum('emails_count'),
         )
+        already_scraped = website_stats['total']
+        unscraped = total_with_website - already_scraped if not force else total_with_website
+
+        with_emails = website_stats['with_emails']
+        total_emails = website_stats['emails_sum'] or 0
         
         self.stdout.write('')
         self.stdout.write('=' * 60)
@@ -118,32 +166,38 @@ class Command(BaseCommand):
         self.stdout.write('=' * 60)
         self.stdout.write(f'  Leads with websites:      {total_with_website:>8}')
         self.stdout.write(f'  Already scraped:          {already_scraped:>8}')
-        self.stdout.write(f'  Pending to scrape:        {pending:>8}')
+        self.stdout.write(f'  Pending to scrape:        {unscraped:>8}')
         self.stdout.write('')
         self.stdout.write(f'  Websites with emails:     {with_emails:>8}')
         self.stdout.write(f'  Total emails found:       {total_emails:>8}')
         self.stdout.write('=' * 60)
         
         if stats_only:
-            # Show breakdown by status
+            # Show breakdown by status - one GROUP BY instead of a count
+            # query per status
+            by_status = dict(
+                LeadWebsite.objects.filter(lead_id__in=lead_ids)
+                .values_list('status')
+                .annotate(n=Count('id'))
+            )
             self.stdout.write('')
             self.stdout.write('STATUS BREAKDOWN:')
             for status in ['completed', 'failed', 'no_content', 'pending']:
-                count = LeadWebsite.objects.filter(lead__in=leads, status=status).count()
-                self.stdout.write(f'  {status:<15} {count:>8}')
+                self.stdout.write(f'  {status:<15} {by_status.get(status, 0):>8}')
             return
-        
+
         # Filter to only pending if not force
         if not force:
-            scraped_lead_ids = LeadWebsite.objects.filter(lead__in=leads).values_list('lead_id', flat=True)
+            scraped_lead_ids = LeadWebsite.objects.filter(lead_id__in=lead_ids).values_list('lead_id', flat=True)
             leads = leads.exclude(pk__in=scraped_lead_ids)
         
         # Apply limit
         if limit:
             leads = leads[:limit]
-        
-        to_scrape = leads.count()
-        
+
+        # Already known from the stats aggregate above - no extra COUNT(*)
+        to_scrape = min(unscraped, limit) if limit else unscraped
+
         if to_scrape == 0:
             self.stdout.write(self.style.SUCCESS('No websites to scrape.'))
             return
@@ -159,48 +213,88 @@ class Command(BaseCommand):
                 self.stdout.write(f'  ... and {to_scrape - 20} more')
             return
         
-        # Scrape websites
+        # Scrape websites. Each scrape is an outbound HTTP fetch, so a
+        # worker pool overlaps the socket waits instead of paying
+        # N x (latency + delay) serially; the delay still throttles each
+        # worker between its own requests.
         self.stdout.write('')
-        self.stdout.write('Scraping websites...')
-        
+        self.stdout.write(f'Scraping websites ({concurrency} workers)...')
+
         scraped = 0
         emails_found = 0
         errors = 0
-        
-        for i, lead in enumerate(leads, 1):
+
+        def scrape_one(lead):
+            # Workers only fetch and parse; persistence happens in batches
+            # on the main thread, so no DB connection is opened per worker
             try:
-                self.stdout.write(f'  [{i}/{to_scrape}] {lead.title[:40]:<40}', ending='')
-                
-                website_data = scrape_lead_website(lead, force=force)
-                
-                if website_data:
+                website_data = build_lead_website(lead)
+                error = None
+            except Exception as e:
+                website_data, error = None, e
+                logger.exception(f'Error scraping {lead.website}')
+            if delay:
+                time.sleep(delay)
+            return lead, website_data, error
+
+        # Progress lines collect in a local buffer flushed every 100 rows;
+        # OutputWrapper flushes per write, so line-by-line progress cost a
+        # syscall per scraped site
+        buf = io.StringIO()
+
+        def flush_progress():
+            if buf.tell():
+                self.stdout.write(buf.getvalue(), ending='')
+                buf.seek(0)
+                buf.truncate()
+
+        # Stream the leads instead of caching the whole queryset, and only
+        # fetch the columns the scrape actually touches
+        lead_iter = leads.only('id', 'title', 'website').iterator(chunk_size=1000)
+
+        pending = []
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [executor.submit(scrape_one, lead) for lead in lead_iter]
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                lead, website_data, error = future.result()
+                prefix = f'  [{i}/{to_scrape}] {lead.title[:40]:<40}'
+
+                if error is not None:
+                    errors += 1
+                    buf.write(prefix + self.style.ERROR(f' ✗ Error: {str(error)[:30]}') + '\n')
+                elif website_data:
+                    pending.append(website_data)
+                    if len(pending) >= batch_size:
+                        self._flush_websites(pending)
                     if website_data.status == 'completed':
                         scraped += 1
                         if website_data.emails_count > 0:
                             emails_found += website_data.emails_count
-                            self.stdout.write(self.style.SUCCESS(f' ✓ {website_data.emails_count} emails'))
+                            buf.write(prefix + self.style.SUCCESS(f' ✓ {website_data.emails_count} emails') + '\n')
                         else:
-                            self.stdout.write(self.style.SUCCESS(' ✓ no emails'))
+                            buf.write(prefix + self.style.SUCCESS(' ✓ no emails') + '\n')
                     elif website_data.status == 'no_content':
                         scraped += 1
-                        self.stdout.write(self.style.WARNING(' ⚠ no content'))
+                        buf.write(prefix + self.style.WARNING(' ⚠ no content') + '\n')
                     else:
                         errors += 1
-                        self.stdout.write(self.style.ERROR(f' ✗ {website_data.error_message[:30]}'))
+                        buf.write(prefix + self.style.ERROR(f' ✗ {website_data.error_message[:30]}') + '\n')
                 else:
-                    self.stdout.write(self.style.WARNING(' ⚠ no website'))
-                
-                # Delay between requests
-                if delay and i < to_scrape:
-                    time.sleep(delay)
-                    
-            except KeyboardInterrupt:
-                self.stdout.write(self.style.WARNING('\n\nInterrupted by user'))
-                break
-            except Exception as e:
-                errors += 1
-                self.stdout.write(self.style.ERROR(f' ✗ Error: {str(e)[:30]}'))
-                logger.exception(f'Error scraping {lead.website}')
+                    buf.write(prefix + self.style.WARNING(' ⚠ no website') + '\n')
+
+                if i % 100 == 0:
+                    flush_progress()
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            flush_progress()
+            self.stdout.write(self.style.WARNING('\n\nInterrupted by user'))
+        else:
+            executor.shutdown()
+        finally:
+            flush_progress()
+            # Persist whatever completed, including on interrupt
+            self._flush_websites(pending)
         
         # Summary
         self.stdout.write('')
@@ -212,6 +306,7 @@ class Command(BaseCommand):
         if errors:
             self.stdout.write(self.style.ERROR(f'  Errors:          {errors}'))
         self.stdout.write('')
-        self.stdout.write(f'  Total websites in DB: {LeadWebsite.objects.count()}')
-        self.stdout.write(f'  Total emails in DB:   {sum(LeadWebsite.objects.values_list("emails_count", flat=True))}')
+        totals = LeadWebsite.objects.aggregate(websites=Count('id'), emails=Sum('emails_count'))
+        self.stdout.write(f'  Total websites in DB: {totals["websites"]}')
+        self.stdout.write(f'  Total emails in DB:   {totals["emails"] or 0}')
         self.stdout.write('=' * 60)
@@ -19,16 +19,27 @@ Usage:
 """
 import logging
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from dateutil import parser as date_parser
 
-from gmaps_leads.models import ScrapeJob, GmapsLead
+from gmaps_leads.models import ScrapeJob, GmapsLead, summarize_keywords
 from gmaps_leads.services import (
-    GmapsScraperService, import_job_results
+    GmapsScraperService, build_job_leads, copy_leads
 )
 
 logger = logging.getLogger(__name__)
 
+# Map API status strings to our status choices
+STATUS_MAP = {
+    'pending': 'pending',
+    'running': 'running',
+    'completed': 'completed',
+    'failed': 'failed',
+    'done': 'completed',
+    'ok': 'completed',  # API uses 'ok' for completed jobs
+}
+
 
 class Command(BaseCommand):
     help = 'Sync all jobs from the Google Maps Scraper API'
@@ -49,11 +60,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Re-import leads even if already imported',
         )
+        parser.add_argument(
+            '--use-copy',
+            action='store_true',
+            help='Insert leads with Postgres COPY (falls back to bulk_create on other backends)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         import_leads = options['import_leads']
         force_reimport = options['force_reimport']
+        use_copy = options['use_copy']
         
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
@@ -71,14 +88,25 @@ class Command(BaseCommand):
         self.stdout.write(f'Found {len(api_jobs)} jobs in scraper API')
         self.stdout.write('')
         
-        # Get existing job IDs from our DB
-        existing_ids = set(ScrapeJob.objects.values_list('external_id', flat=True))
-        
+        # Fetch existing jobs keyed by external id in one query instead of
+        # a get() per API job
+        existing = ScrapeJob.objects.in_bulk(
+            [j.get('ID') or j.get('id') for j in api_jobs if j.get('ID') or j.get('id')],
+            field_name='external_id',
+        )
+
         # Stats
         new_jobs = 0
         updated_jobs = 0
         imported_leads = 0
-        
+
+        # Status changes accumulate for one bulk_update; imports run after
+        # the flush so they see the updated statuses
+        changed_jobs = []
+        new_jobs_batch = []
+        api_dates = {}  # external_id -> created_at reported by the API
+        to_import = []
+
         for api_job in api_jobs:
             # API returns capitalized field names: ID, Name, Status, Data, Date
             job_id = api_job.get('ID') or api_job.get('id')
@@ -93,50 +121,27 @@ class Command(BaseCommand):
                 continue
             
             job_id_short = job_id[:8] if len(job_id) > 8 else job_id
+            job_status_lower = job_status.lower()
             self.stdout.write(f'  [{job_status.upper():10}] {job_name} ({job_id_short}...)')
             
-            if job_id in existing_ids:
+            if job_id in existing:
                 # Update existing job
                 if not dry_run:
-                    job = ScrapeJob.objects.get(external_id=job_id)
+                    job = existing[job_id]
                     old_status = job.status
-                    
-                    # Map API status to our status
-                    status_map = {
-                        'pending': 'pending',
-                        'running': 'running',
-                        'completed': 'completed',
-                        'failed': 'failed',
-                        'done': 'completed',
-                        'ok': 'completed',  # API uses 'ok' for completed jobs
-                    }
-                    new_status = status_map.get(job_status.lower(), job_status.lower())
-                    
+                    new_status = STATUS_MAP.get(job_status_lower, job_status_lower)
+
                     if old_status != new_status:
                         job.status = new_status
                         if new_status == 'completed':
                             job.completed_at = timezone.now()
-                        job.save()
+                        changed_jobs.append(job)
                         self.stdout.write(f'      → Status updated: {old_status} → {new_status}')
                         updated_jobs += 1
-                    
-                    # Import leads if requested
+
+                    # Import leads if requested (runs after the bulk flush)
                     if import_leads and new_status == 'completed':
-                        if job.leads_count == 0 or force_reimport:
-                            if force_reimport and job.leads_count > 0:
-                                self.stdout.write(f'      → Clearing {job.leads_count} existing leads...')
-                                GmapsLead.objects.filter(job=job).delete()
-                                job.leads_count = 0
-                                job.save()
-                            
-                            try:
-                                count = import_job_results(job)
-                                imported_leads += count
-                                self.stdout.write(self.style.SUCCESS(f'      → Imported {count} leads'))
-                            except Exception as e:
-                                self.stdout.write(self.style.ERROR(f'      → Import failed: {e}'))
-                        else:
-                            self.stdout.write(f'      → Already has {job.leads_count} leads (use --force-reimport to re-import)')
+                        to_import.append(job)
             else:
                 # Create new job
                 self.stdout.write(self.style.SUCCESS(f'      → NEW JOB'))
@@ -150,23 +155,19 @@ class Command(BaseCommand):
                             created_at = date_parser.parse(job_date)
                         except:
                             pass
-                    
+
                     # Map API status
-                    status_map = {
-                        'pending': 'pending',
-                        'running': 'running', 
-                        'completed': 'completed',
-                        'failed': 'failed',
-                        'done': 'completed',
-                        'ok': 'completed',  # API uses 'ok' for completed jobs
-                    }
-                    status = status_map.get(job_status.lower(), 'pending')
-                    
-                    # Create the job
-                    job = ScrapeJob.objects.create(
+                    status = STATUS_MAP.get(job_status_lower, 'pending')
+
+                    # Build the job; it is inserted with the batch below.
+                    # bulk_create skips save(), so keywords_preview is set
+                    # here explicitly.
+                    keywords = job_data.get('keywords', [])
+                    job = ScrapeJob(
                         external_id=job_id,
                         name=job_name,
-                        keywords=job_data.get('keywords', []),
+                        keywords=keywords,
+                        keywords_preview=summarize_keywords(keywords),
                         lang=job_data.get('lang', 'en'),
                         zoom=job_data.get('zoom', 15),
                         lat=job_data.get('lat'),
@@ -180,20 +181,91 @@ class Command(BaseCommand):
                         status=status,
                         completed_at=timezone.now() if status == 'completed' else None,
                     )
-                    
-                    # Override created_at if we have it
+                    new_jobs_batch.append(job)
                     if created_at:
-                        ScrapeJob.objects.filter(pk=job.pk).update(created_at=created_at)
-                    
+                        api_dates[job_id] = created_at
+
                     # Import leads if requested and completed
                     if import_leads and status == 'completed':
-                        try:
-                            count = import_job_results(job)
-                            imported_leads += count
-                            self.stdout.write(self.style.SUCCESS(f'      → Imported {count} leads'))
-                        except Exception as e:
-                            self.stdout.write(self.style.ERROR(f'      → Import failed: {e}'))
-        
+                        to_import.append(job)
+
+        # Flush everything in one transaction: one INSERT batch for new
+        # jobs (plus a created_at backfill, since auto_now_add stamps the
+        # insert time) and one UPDATE batch for status changes.
+        with transaction.atomic():
+            if new_jobs_batch:
+                ScrapeJob.objects.bulk_create(new_jobs_batch, batch_size=1000)
+                backdated = []
+                for job in new_jobs_batch:
+                    if job.external_id in api_dates:
+                        job.created_at = api_dates[job.external_id]
+                        backdated.append(job)
+                if backdated:
+                    ScrapeJob.objects.bulk_update(backdated, ['created_at'], batch_size=1000)
+            if changed_jobs:
+                ScrapeJob.objects.bulk_update(changed_jobs, ['status', 'completed_at'], batch_size=1000)
+
+        if to_import:
+            self.stdout.write('')
+            self.stdout.write(f'Importing leads for {len(to_import)} completed job(s)...')
+
+            # Parse every job's CSV into unsaved leads first, then insert
+            # them all in one bulk_create batch instead of a transaction
+            # per job
+            all_leads = []
+            parsed = []  # (job, leads_created, duplicates_skipped, errors, csv_path)
+            service = GmapsScraperService()
+
+            for job in to_import:
+                self.stdout.write(f'  {job.name}:')
+                if job.leads_count == 0 or force_reimport:
+                    if force_reimport and job.leads_count > 0:
+                        self.stdout.write(f'      → Clearing {job.leads_count} existing leads...')
+                        GmapsLead.objects.filter(job=job).delete()
+                        job.leads_count = 0
+                        job.save(update_fields=['leads_count'])
+
+                    try:
+                        csv_path = service.download_csv_to_file(job.external_id)
+                        if not csv_path:
+                            raise ValueError('Failed to download CSV file. Job may not be ready yet.')
+                        leads, duplicates, errors = build_job_leads(job, csv_path)
+                        all_leads.extend(leads)
+                        parsed.append((job, len(leads), duplicates, errors, csv_path))
+                        self.stdout.write(self.style.SUCCESS(f'      → Parsed {len(leads)} leads'))
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f'      → Import failed: {e}'))
+                else:
+                    self.stdout.write(f'      → Already has {job.leads_count} leads (use --force-reimport to re-import)')
+
+            if parsed:
+                with transaction.atomic():
+                    if not (use_copy and copy_leads(all_leads)):
+                        GmapsLead.objects.bulk_create(all_leads, batch_size=10000)
+                    finalized = []
+                    for job, leads_created, duplicates, errors, csv_path in parsed:
+                        imported_leads += leads_created
+                        job.leads_count += leads_created
+                        job.status = 'completed'
+                        job.completed_at = job.completed_at or timezone.now()
+                        job.csv_file_path = csv_path
+                        if errors:
+                            job.error_message = f'Imported with {len(errors)} errors. First error: {errors[0]}'
+                        elif duplicates:
+                            job.error_message = f'Skipped {duplicates} duplicate rows'
+                        else:
+                            job.error_message = None
+                        finalized.append(job)
+                    ScrapeJob.objects.bulk_update(
+                        finalized,
+                        ['leads_count', 'status', 'completed_at', 'csv_file_path', 'error_message'],
+                        batch_size=1000,
+                    )
+                self.stdout.write('')
+                self.stdout.write(self.style.SUCCESS(
+                    f'Inserted {len(all_leads)} leads across {len(parsed)} job(s) in one batch'
+                ))
+
         # Summary
         self.stdout.write('')
         self.stdout.write('=' * 50)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-08-26 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0011_deduplicate_leads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gmapslead',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Phone stripped to digits only (kept in sync by save(), used for indexed prefix filters)', max_length=20),
+        ),
+    ]
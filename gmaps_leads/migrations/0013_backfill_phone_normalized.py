@@ -0,0 +1,36 @@
+# Generated by Django 4.2.9 on 2026-08-26 00:00
+
+from django.db import migrations
+
+
+def backfill_phone_normalized(apps, schema_editor):
+    """
+    Populate phone_normalized (digits-only copy of phone) for existing leads.
+
+    New/updated leads get it from GmapsLead.save(); this one-off pass covers
+    rows created before the column existed.
+    """
+    Lead = apps.get_model('gmaps_leads', 'GmapsLead')
+
+    batch = []
+    qs = Lead.objects.exclude(phone__isnull=True).exclude(phone='').only('id', 'phone')
+    for lead in qs.iterator(chunk_size=2000):
+        lead.phone_normalized = ''.join(c for c in lead.phone if c.isdigit())
+        batch.append(lead)
+        if len(batch) >= 500:
+            Lead.objects.bulk_update(batch, ['phone_normalized'])
+            batch = []
+
+    if batch:
+        Lead.objects.bulk_update(batch, ['phone_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0012_gmapslead_phone_normalized'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_phone_normalized, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0013_backfill_phone_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gmapslead',
+            name='city',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='City from complete_address (denormalized by save() for list display and filtering)', max_length=128),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.9 on 2026-08-26 00:00
+
+from django.db import migrations
+
+
+def backfill_city(apps, schema_editor):
+    """
+    Populate the denormalized city column for existing leads.
+
+    New/updated leads get it from GmapsLead.save(); this covers rows
+    imported before the column existed.
+    """
+    Lead = apps.get_model('gmaps_leads', 'GmapsLead')
+
+    batch = []
+    qs = Lead.objects.exclude(complete_address__isnull=True).only('id', 'complete_address')
+    for lead in qs.iterator(chunk_size=2000):
+        if not isinstance(lead.complete_address, dict):
+            continue
+        city = (lead.complete_address.get('city') or '')[:128]
+        if not city:
+            continue
+        lead.city = city
+        batch.append(lead)
+        if len(batch) >= 500:
+            Lead.objects.bulk_update(batch, ['city'])
+            batch = []
+
+    if batch:
+        Lead.objects.bulk_update(batch, ['city'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0014_gmapslead_city'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_city, reverse_code=migrations.RunPython.noop),
+    ]
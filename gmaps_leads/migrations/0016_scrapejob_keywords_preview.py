@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0015_backfill_city'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapejob',
+            name='keywords_preview',
+            field=models.CharField(blank=True, default='', help_text='First keywords for list display (kept in sync by save(); lets the changelist defer the full list)', max_length=128),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.9 on 2026-08-26 00:00
+
+from django.db import migrations
+
+
+def _summarize(keywords):
+    if not keywords:
+        return ''
+    return (', '.join(keywords[:3]) + ('...' if len(keywords) > 3 else ''))[:128]
+
+
+def backfill_keywords_preview(apps, schema_editor):
+    """Populate keywords_preview for jobs created before the column existed."""
+    ScrapeJob = apps.get_model('gmaps_leads', 'ScrapeJob')
+
+    batch = []
+    for job in ScrapeJob.objects.only('id', 'keywords').iterator(chunk_size=2000):
+        preview = _summarize(job.keywords)
+        if not preview:
+            continue
+        job.keywords_preview = preview
+        batch.append(job)
+        if len(batch) >= 500:
+            ScrapeJob.objects.bulk_update(batch, ['keywords_preview'])
+            batch = []
+
+    if batch:
+        ScrapeJob.objects.bulk_update(batch, ['keywords_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0016_scrapejob_keywords_preview'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_keywords_preview, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.9 on 2026-08-26 00:00
+
+from django.db import migrations
+
+# Columns behind GmapsLeadAdmin.search_fields; admin search issues
+# ILIKE '%term%' against each, which btree indexes cannot serve.
+SEARCH_COLUMNS = ('title', 'address', 'phone', 'website', 'category')
+
+
+def create_trgm_indexes(apps, schema_editor):
+    """
+    pg_trgm GIN indexes so admin icontains search uses index lookups
+    instead of full scans. Postgres only - the sqlite dev database keeps
+    its (already sequential) LIKE behaviour.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in SEARCH_COLUMNS:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS gmapslead_{column}_trgm '
+                f'ON gmaps_leads_gmapslead USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for column in SEARCH_COLUMNS:
+            cursor.execute(f'DROP INDEX IF EXISTS gmapslead_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0017_backfill_keywords_preview'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, reverse_code=drop_trgm_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0018_trgm_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gmapslead',
+            name='has_contactable_email',
+            field=models.BooleanField(db_index=True, default=False, help_text='Whether the scraped website yielded at least one email (kept in sync by LeadWebsite.save())'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.9 on 2026-08-26 00:00
+
+from django.db import migrations
+
+
+def backfill_has_contactable_email(apps, schema_editor):
+    """Flag leads whose scraped website already yielded emails."""
+    Lead = apps.get_model('gmaps_leads', 'GmapsLead')
+    Lead.objects.filter(website_data__emails_count__gt=0).update(has_contactable_email=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0019_gmapslead_has_contactable_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_has_contactable_email, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0020_backfill_has_contactable_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customizedcontact',
+            index=models.Index(fields=['status', '-created_at'], name='cc_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customizedcontact',
+            index=models.Index(fields=['lead', 'template_type'], name='cc_lead_type_idx'),
+        ),
+    ]
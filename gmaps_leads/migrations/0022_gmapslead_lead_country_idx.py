@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:53
+
+from django.db import migrations, models
+import django.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gmaps_leads', '0021_customizedcontact_cc_status_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gmapslead',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('country', 'complete_address'), name='lead_country_idx'),
+        ),
+    ]
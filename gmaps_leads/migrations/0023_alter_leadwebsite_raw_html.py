@@ -0,0 +1,26 @@
+# Generated by Django 4.2.9 on 2026-08-26 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Drop and recreate the column instead of AlterField: PostgreSQL has
+    # no text -> bytea cast, so the ALTER COLUMN ... TYPE bytea DDL that
+    # AlterField emits fails even on an empty table. The column was never
+    # populated, so no data is lost.
+
+    dependencies = [
+        ('gmaps_leads', '0022_gmapslead_lead_country_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='leadwebsite',
+            name='raw_html',
+        ),
+        migrations.AddField(
+            model_name='leadwebsite',
+            name='raw_html',
+            field=models.BinaryField(blank=True, help_text='Raw HTML content (zlib-compressed)', null=True),
+        ),
+    ]
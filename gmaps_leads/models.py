@@ -1,9 +1,67 @@
+import re
+import zlib
+
 from django.db import models
+from django.db.models import Case, CharField, Q, Value, When
+from django.db.models.fields.json import KeyTextTransform
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 User = get_user_model()
 
+# Turkish number prefixes for phone classification. startswith over the
+# digits-only string is far cheaper than regex matching and is shared by the
+# phone_type property, the admin columns and the extraction action.
+TR_MOBILE_PREFIXES = ('905',)
+TR_LANDLINE_PREFIXES = ('902', '903', '904')
+
+# C-level digit stripping; ~10x a per-character Python generator on the
+# ingest and save hot paths
+_NONDIGIT = re.compile(r'\D')
+
+
+def strip_phone(phone):
+    """Return the digits-only form of a phone string ('' when empty)."""
+    return _NONDIGIT.sub('', phone) if phone else ''
+
+
+def summarize_keywords(keywords):
+    """Short display preview of a keywords list: first three, '...' if more."""
+    if not keywords:
+        return ''
+    preview = ', '.join(keywords[:3]) + ('...' if len(keywords) > 3 else '')
+    return preview[:128]
+
+
+def classify_phone(digits):
+    """Classify a digits-only phone string: 'whatsapp', 'local', 'other' or 'none'."""
+    if not digits:
+        return 'none'
+    if digits.startswith(TR_MOBILE_PREFIXES) and len(digits) >= 12:
+        return 'whatsapp'
+    if digits.startswith(TR_LANDLINE_PREFIXES) and len(digits) >= 11:
+        return 'local'
+    return 'other'
+
+
+# DB-side mirror of classify_phone over the indexed phone_normalized column.
+# phone_normalized is the materialized digits-only phone (synced by
+# GmapsLead.save()), so classification stays O(writes) and querysets can
+# annotate/filter/sort on the label without regex scans.
+PHONE_TYPE_CASE = Case(
+    When(phone_normalized__startswith='905', then=Value('whatsapp')),
+    When(
+        Q(phone_normalized__startswith='902') |
+        Q(phone_normalized__startswith='903') |
+        Q(phone_normalized__startswith='904'),
+        then=Value('local'),
+    ),
+    When(phone_normalized='', then=Value('none')),
+    default=Value('other'),
+    output_field=CharField(),
+)
+
 
 class ScrapeJob(models.Model):
     """
@@ -29,6 +87,7 @@ class ScrapeJob(models.Model):
     
     # Job configuration
     keywords = models.JSONField(help_text="List of search keywords")
+    keywords_preview = models.CharField(max_length=128, blank=True, default='', help_text="First keywords for list display (kept in sync by save(); lets the changelist defer the full list)")
     lang = models.CharField(max_length=10, default='en', help_text="Language code")
     zoom = models.IntegerField(default=15, help_text="Map zoom level")
     lat = models.CharField(max_length=50, blank=True, null=True, help_text="Latitude")
@@ -61,7 +120,11 @@ class ScrapeJob(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.status})"
-    
+
+    def save(self, *args, **kwargs):
+        self.keywords_preview = summarize_keywords(self.keywords)
+        super().save(*args, **kwargs)
+
     @property
     def age_seconds(self):
         """Return job age in seconds."""
@@ -106,7 +169,9 @@ class GmapsLead(models.Model):
     # Contact Info
     address = models.TextField(blank=True, null=True, help_text="Full address")
     phone = models.CharField(max_length=50, blank=True, null=True, help_text="Phone number")
+    phone_normalized = models.CharField(max_length=20, blank=True, default='', db_index=True, help_text="Phone stripped to digits only (kept in sync by save(), used for indexed prefix filters)")
     website = models.URLField(max_length=2000, blank=True, null=True, help_text="Business website")
+    has_contactable_email = models.BooleanField(default=False, db_index=True, help_text="Whether the scraped website yielded at least one email (kept in sync by LeadWebsite.save())")
     plus_code = models.CharField(max_length=100, blank=True, null=True, help_text="Google Plus Code")
     emails = models.TextField(blank=True, null=True, help_text="Email addresses (comma-separated or JSON)")
     
@@ -117,6 +182,7 @@ class GmapsLead(models.Model):
     
     # Complete Address (parsed)
     complete_address = models.JSONField(blank=True, null=True, help_text="Parsed address as JSON (borough, street, city, postal_code, state, country)")
+    city = models.CharField(max_length=128, blank=True, default='', db_index=True, help_text="City from complete_address (denormalized by save() for list display and filtering)")
     
     # Hours & Times
     open_hours = models.JSONField(blank=True, null=True, help_text="Opening hours as JSON")
@@ -161,6 +227,12 @@ class GmapsLead(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['phone']),
             models.Index(fields=['review_rating']),
+            # Matches the country annotation/filter expression so those
+            # queries don't extract the JSON key per row
+            models.Index(
+                KeyTextTransform('country', 'complete_address'),
+                name='lead_country_idx',
+            ),
         ]
         constraints = [
             models.UniqueConstraint(fields=['job', 'cid'], name='gmapslead_job_cid_unique'),
@@ -170,7 +242,17 @@ class GmapsLead(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.category or 'No category'}"
-    
+
+    def save(self, *args, **kwargs):
+        # Keep the digits-only copy in sync so admin filters can use indexed
+        # prefix lookups instead of regex scans over the raw phone column
+        self.phone_normalized = strip_phone(self.phone)
+        # Denormalize the city so list pages sort/filter on an indexed
+        # column instead of parsing the JSON dict per row
+        if isinstance(self.complete_address, dict):
+            self.city = (self.complete_address.get('city') or '')[:128]
+        super().save(*args, **kwargs)
+
     @property
     def phone_type(self):
         """
@@ -179,28 +261,16 @@ class GmapsLead(models.Model):
         """
         if not self.phone:
             return 'none'
-        
-        # Clean the phone number
-        cleaned = ''.join(c for c in self.phone if c.isdigit())
-        
-        # Turkish mobile numbers (WhatsApp eligible): 905XX
-        if cleaned.startswith('905') and len(cleaned) >= 12:
-            return 'whatsapp'
-        # Turkish landlines: 90212, 90216, etc.
-        elif cleaned.startswith('90') and len(cleaned) >= 11:
-            prefix = cleaned[2:5] if len(cleaned) > 5 else ''
-            if prefix.startswith('2') or prefix.startswith('3') or prefix.startswith('4'):
-                return 'local'
-            return 'other'
-        else:
-            return 'other'
+        # Reuse the synced digits-only column when available so repeated
+        # calls (admin rows, extraction loops) skip the per-call strip.
+        return classify_phone(self.phone_normalized or self.cleaned_phone)
     
     @property
     def cleaned_phone(self):
         """Return phone with only digits."""
         if not self.phone:
             return None
-        return ''.join(c for c in self.phone if c.isdigit())
+        return self.phone_normalized or strip_phone(self.phone)
     
     @property
     def has_website(self):
@@ -252,36 +322,60 @@ class WhatsAppContact(models.Model):
         return f"{self.business_name} - {self.chat_id}"
     
     @classmethod
-    def create_from_lead(cls, lead: GmapsLead) -> 'WhatsAppContact':
+    def build_from_lead(cls, lead: GmapsLead) -> 'WhatsAppContact':
         """
-        Create a WhatsAppContact from a GmapsLead.
-        
+        Build an unsaved WhatsAppContact from a GmapsLead, so batch callers
+        can collect instances and flush them with bulk_create.
+
         Args:
             lead: GmapsLead instance with a WhatsApp-eligible phone number
-            
+
         Returns:
-            WhatsAppContact instance
+            Unsaved WhatsAppContact instance
         """
         if lead.phone_type != 'whatsapp':
             raise ValueError(f"Lead phone is not WhatsApp eligible: {lead.phone}")
-        
+
         phone = lead.cleaned_phone
-        
-        # Format: 905XXXXXXXX@c.us (Chat ID)
-        chat_id = f"{phone}@c.us"
-        
-        # Format: 905XXXXXXXX@s.whatsapp.net (JID)
-        jid = f"{phone}@s.whatsapp.net"
-        
-        return cls.objects.create(
+
+        return cls(
             lead=lead,
             phone_number=phone,
-            chat_id=chat_id,
-            jid=jid,
+            chat_id=f"{phone}@c.us",       # 905XXXXXXXX@c.us
+            jid=f"{phone}@s.whatsapp.net",  # 905XXXXXXXX@s.whatsapp.net
             business_name=lead.title,
             category=lead.category,
         )
 
+    @classmethod
+    def create_from_lead(cls, lead: GmapsLead) -> 'WhatsAppContact':
+        """Create and save a WhatsAppContact from a GmapsLead."""
+        contact = cls.build_from_lead(lead)
+        contact.save()
+        return contact
+
+    @classmethod
+    def bulk_create_from_leads(cls, leads) -> int:
+        """
+        Insert contacts for every WhatsApp-eligible lead without an
+        existing contact, in one bulk_create instead of a save() per lead.
+
+        Callers iterating a queryset should select_related
+        ('whatsapp_contact') so the existing-contact check stays free.
+
+        Args:
+            leads: Iterable of GmapsLead instances
+
+        Returns:
+            Number of contacts inserted
+        """
+        to_create = [
+            cls.build_from_lead(lead)
+            for lead in leads
+            if lead.phone_type == 'whatsapp' and getattr(lead, 'whatsapp_contact', None) is None
+        ]
+        return len(cls.objects.bulk_create(to_create, batch_size=1000, ignore_conflicts=True))
+
 
 class LeadWebsite(models.Model):
     """
@@ -346,8 +440,9 @@ class LeadWebsite(models.Model):
     full_text = models.TextField(blank=True, null=True, help_text="Full page text content (cleaned)")
     full_text_length = models.IntegerField(default=0, help_text="Character count of full text")
     
-    # Raw HTML (optional, for re-processing)
-    raw_html = models.TextField(blank=True, null=True, help_text="Raw HTML content (compressed)")
+    # Raw HTML (optional, for re-processing); stored zlib-compressed,
+    # read/written through the raw_html_text property
+    raw_html = models.BinaryField(blank=True, null=True, help_text="Raw HTML content (zlib-compressed)")
     
     # ===== AI-READY SUMMARY =====
     # This will be populated by AI in the future
@@ -374,11 +469,31 @@ class LeadWebsite(models.Model):
 
     def __str__(self):
         return f"{self.lead.title} - {self.url}"
-    
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the denormalized flag on the lead in sync so admin filters
+        # test an indexed boolean instead of a JSON length lookup
+        has_email = bool(self.emails)
+        GmapsLead.objects.filter(pk=self.lead_id).exclude(
+            has_contactable_email=has_email
+        ).update(has_contactable_email=has_email)
+
+    @property
+    def raw_html_text(self):
+        """Decompressed raw HTML, or None when not stored."""
+        if not self.raw_html:
+            return None
+        return zlib.decompress(bytes(self.raw_html)).decode('utf-8')
+
+    @raw_html_text.setter
+    def raw_html_text(self, html):
+        self.raw_html = zlib.compress(html.encode('utf-8'), 9) if html else None
+
     @property
     def has_emails(self):
         return self.emails_count > 0
-    
+
     @property
     def has_content(self):
         return bool(self.full_text and len(self.full_text) > 100)
@@ -467,6 +582,22 @@ class CustomizedContact(models.Model):
         """Return True if this contact is marked as ready."""
         return getattr(self, 'status', None) == 'ready'
 
+    @cached_property
+    def target_email(self):
+        """
+        Best email to send to: explicit recipient, else first scraped email.
+
+        Cached per instance since resolving it touches lead.website_data;
+        callers iterating many contacts should select_related
+        ('lead__website_data') so the lookup never queries.
+        """
+        if self.recipient_email:
+            return self.recipient_email
+        website = getattr(self.lead, 'website_data', None)
+        if website and website.emails:
+            return website.emails[0]
+        return None
+
     def html_to_whatsapp(self, html):
         """
         Convert HTML to WhatsApp-friendly formatting:
@@ -533,6 +664,11 @@ class CustomizedContact(models.Model):
         verbose_name = "Customized Contact"
         verbose_name_plural = "Customized Contacts"
         ordering = ['-id']
+        indexes = [
+            # Covers the changelist's WHERE status = ? ORDER BY created_at
+            models.Index(fields=['status', '-created_at'], name='cc_status_created_idx'),
+            models.Index(fields=['lead', 'template_type'], name='cc_lead_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.lead.title} - {self.subject[:50]}"
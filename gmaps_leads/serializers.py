@@ -34,10 +34,15 @@ class ScrapeJobSerializer(serializers.ModelSerializer):
 
 
 class GmapsLeadSerializer(serializers.ModelSerializer):
-    """Serializer for GmapsLead model."""
-    city = serializers.SerializerMethodField()
-    country = serializers.SerializerMethodField()
-    
+    """
+    Serializer for GmapsLead model.
+
+    city reads the denormalized column kept in sync at ingest; country is
+    a queryset annotation (see views.with_address_parts) extracted from
+    complete_address in the database instead of per-object in Python.
+    """
+    country = serializers.CharField(read_only=True, allow_null=True)
+
     class Meta:
         model = GmapsLead
         fields = [
@@ -51,33 +56,18 @@ class GmapsLeadSerializer(serializers.ModelSerializer):
             'order_online', 'menu', 'owner', 'created_at', 'updated_at',
             'city', 'country'
         ]
-    
-    def get_city(self, obj) -> str | None:
-        if obj.complete_address and isinstance(obj.complete_address, dict):
-            return obj.complete_address.get('city')
-        return None
-    
-    def get_country(self, obj):
-        if obj.complete_address and isinstance(obj.complete_address, dict):
-            return obj.complete_address.get('country')
-        return None
 
 
 class GmapsLeadListSerializer(serializers.ModelSerializer):
-    """Simplified serializer for listing leads."""
-    city = serializers.SerializerMethodField()
-    
+    """Simplified serializer for listing leads. city is the denormalized
+    model column, not parsed from JSON per object."""
+
     class Meta:
         model = GmapsLead
         fields = [
             'id', 'title', 'category', 'address', 'phone', 'website',
             'review_count', 'review_rating', 'city', 'created_at'
         ]
-    
-    def get_city(self, obj) -> str | None:
-        if obj.complete_address and isinstance(obj.complete_address, dict):
-            return obj.complete_address.get('city')
-        return None
 
 
 # ============================================================================
@@ -14,12 +14,13 @@ import logging
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 import requests
 
-from .models import ScrapeJob, GmapsLead
+from .models import ScrapeJob, GmapsLead, strip_phone
 
 logger = logging.getLogger(__name__)
 
@@ -113,10 +114,14 @@ class GmapsScraperService:
         job_data = self.get_job(job_id)
         if not job_data:
             return False, 'not_found'
-        
+        return self.map_job_status(job_data)
+
+    @staticmethod
+    def map_job_status(job_data: dict) -> Tuple[bool, str]:
+        """Map an API job dict to (is_ready, local status string)."""
         # API may return 'Status' or 'status' (capitalized)
         status = (job_data.get('Status') or job_data.get('status', '')).lower()
-        
+
         # Map various status strings
         if status in ['completed', 'done', 'finished', 'ready', 'ok']:
             return True, 'completed'
@@ -265,23 +270,28 @@ def create_scrape_job(job_data: dict, user=None) -> ScrapeJob:
     return job
 
 
-def refresh_job_status(job: ScrapeJob) -> ScrapeJob:
+def refresh_job_status(job: ScrapeJob, api_data: dict = None) -> ScrapeJob:
     """
     Check job status from the scraper API.
-    
+
     Note: Jobs take at least 3-5 minutes to complete.
     Don't poll too frequently.
-    
+
     Args:
         job: ScrapeJob instance to refresh
-        
+        api_data: Optional job dict already fetched from the API (e.g. via
+            get_all_jobs), so batch callers avoid a per-job HTTP round-trip
+
     Returns:
         Updated ScrapeJob instance
     """
     service = GmapsScraperService()
-    
-    is_ready, status = service.is_job_ready(job.external_id)
-    
+
+    if api_data is not None:
+        is_ready, status = service.map_job_status(api_data)
+    else:
+        is_ready, status = service.is_job_ready(job.external_id)
+
     if status == 'not_found':
         logger.warning(f"Job {job.external_id} not found in API")
         # Don't change local status - might be a temporary API issue
@@ -294,76 +304,68 @@ def refresh_job_status(job: ScrapeJob) -> ScrapeJob:
     elif status == 'failed':
         job.status = 'failed'
         # Try to get error message
-        job_data = service.get_job(job.external_id)
+        job_data = api_data or service.get_job(job.external_id)
         if job_data:
             job.error_message = job_data.get('error', 'Job failed')
     elif status == 'running':
         job.status = 'running'
     # else keep as pending
     
-    job.save()
+    # Only the status columns changed - a full save() would rewrite every
+    # column including the keywords/proxies JSON blobs
+    job.save(update_fields=['status', 'completed_at', 'error_message', 'updated_at', 'keywords_preview'])
     logger.info(f"Job {job.external_id} status: {job.status}")
     
     return job
 
 
-def import_job_results(job: ScrapeJob) -> int:
+def import_job_results(job: ScrapeJob, csv_path: str = None, use_copy: bool = False) -> int:
     """
     Download CSV to local file and import leads into database.
-    
+
     This approach:
     1. Downloads CSV to local file (avoids memory/HTTP timeout issues)
     2. Parses the local file
     3. Creates lead records
-    
+
     Args:
         job: ScrapeJob instance
-        
+        csv_path: Optional path to an already-downloaded CSV; skips the
+            readiness check and download when given
+        use_copy: Prefer Postgres COPY over bulk_create for the insert
+
     Returns:
         Number of leads imported
     """
-    service = GmapsScraperService()
-    
-    # First check if job is actually ready
-    is_ready, status = service.is_job_ready(job.external_id)
-    
-    if not is_ready:
-        if status == 'failed':
-            raise ValueError(f"Job failed, cannot import results")
-        elif status == 'not_found':
-            raise ValueError(f"Job not found in API")
-        else:
-            raise ValueError(f"Job not ready yet (status: {status}). Please wait and try again.")
-    
-    # Download CSV to local file
-    csv_path = service.download_csv_to_file(job.external_id)
-    
+    if csv_path is None:
+        service = GmapsScraperService()
+
+        # First check if job is actually ready
+        is_ready, status = service.is_job_ready(job.external_id)
+
+        if not is_ready:
+            if status == 'failed':
+                raise ValueError(f"Job failed, cannot import results")
+            elif status == 'not_found':
+                raise ValueError(f"Job not found in API")
+            else:
+                raise ValueError(f"Job not ready yet (status: {status}). Please wait and try again.")
+
+        # Download CSV to local file
+        csv_path = service.download_csv_to_file(job.external_id)
+
     if not csv_path:
         raise ValueError("Failed to download CSV file. Job may not be ready yet.")
     
-    # Parse local CSV file
-    leads_created = 0
-    duplicates_skipped = 0
-    errors = []
-    
+    # Parse local CSV file, then insert in one batch instead of a
+    # row-at-a-time create
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            for row_num, row in enumerate(reader, start=2):  # start=2 because row 1 is header
-                try:
-                    existing = _find_existing_lead(row, job)
-                    if existing:
-                        duplicates_skipped += 1
-                        continue
-                    
-                    lead = _create_lead_from_csv_row(row, job)
-                    if lead:
-                        leads_created += 1
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    logger.warning(f"Failed to import row {row_num}: {e}")
-        
+        leads, duplicates_skipped, errors = build_job_leads(job, csv_path)
+        if not (use_copy and copy_leads(leads)):
+            with transaction.atomic():
+                GmapsLead.objects.bulk_create(leads, batch_size=1000)
+        leads_created = len(leads)
+
         # Update job stats
         job.leads_count = job.leads.count()
         job.status = 'completed'
@@ -376,9 +378,14 @@ def import_job_results(job: ScrapeJob) -> int:
             job.error_message = f"Skipped {duplicates_skipped} duplicate rows"
         else:
             job.error_message = None
-        
-        job.save()
-        
+
+        # One UPDATE of just the stat columns instead of rewriting the
+        # whole row
+        job.save(update_fields=[
+            'leads_count', 'status', 'completed_at', 'csv_file_path',
+            'error_message', 'updated_at',
+        ])
+
         logger.info(f"Imported {leads_created} leads from job {job.external_id}")
         
     except Exception as e:
@@ -456,16 +463,16 @@ def _find_existing_lead(row: dict, job: ScrapeJob) -> Optional[GmapsLead]:
     return None
 
 
-def _create_lead_from_csv_row(row: dict, job: ScrapeJob) -> Optional[GmapsLead]:
+def _build_lead_from_csv_row(row: dict, job: ScrapeJob) -> Optional[GmapsLead]:
     """
-    Create a GmapsLead from a CSV row.
-    
+    Build an unsaved GmapsLead from a CSV row.
+
     Args:
         row: CSV row as dictionary
         job: Parent ScrapeJob
-        
+
     Returns:
-        Created GmapsLead or None if failed
+        Unsaved GmapsLead or None if failed
     """
     try:
         # Parse numeric fields
@@ -483,7 +490,7 @@ def _create_lead_from_csv_row(row: dict, job: ScrapeJob) -> Optional[GmapsLead]:
         reviews_link = _normalize_str(row.get('reviews_link'), 2000)
         thumbnail = _normalize_str(row.get('thumbnail'), 2000)
         
-        lead = GmapsLead.objects.create(
+        lead = GmapsLead(
             job=job,
             input_id=row.get('input_id'),
             cid=cid,
@@ -519,8 +526,86 @@ def _create_lead_from_csv_row(row: dict, job: ScrapeJob) -> Optional[GmapsLead]:
             menu=_parse_json_field(row.get('menu')),
             owner=_parse_json_field(row.get('owner')),
         )
+        # bulk_create skips save(), so mirror its denormalizations here
+        lead.phone_normalized = strip_phone(lead.phone)
+        if isinstance(lead.complete_address, dict):
+            lead.city = (lead.complete_address.get('city') or '')[:128]
         return lead
-        
+
     except Exception as e:
         logger.error(f"Failed to create lead from row: {e}")
         return None
+
+
+def copy_leads(leads: List[GmapsLead]) -> bool:
+    """
+    Insert leads with Postgres COPY ... FROM STDIN, which beats
+    bulk_create's multi-row INSERTs on large jobs.
+
+    Requires the postgresql backend on psycopg 3; returns False when
+    that is not available (e.g. the sqlite dev database) so callers can
+    fall back to bulk_create. Inserted instances do not get their pk
+    set.
+    """
+    if not leads or connection.vendor != 'postgresql':
+        return False
+
+    meta = GmapsLead._meta
+    fields = [f for f in meta.concrete_fields if not f.primary_key]
+    columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+    sql = f'COPY {connection.ops.quote_name(meta.db_table)} ({columns}) FROM STDIN'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy = getattr(cursor.cursor, 'copy', None)  # psycopg 3 only
+        if copy is None:
+            return False
+        with copy(sql) as cp:
+            for lead in leads:
+                row = []
+                for f in fields:
+                    # pre_save stamps auto_now/auto_now_add the same way
+                    # save() would
+                    value = f.pre_save(lead, add=True)
+                    if value is not None and f.get_internal_type() == 'JSONField':
+                        value = json.dumps(value)
+                    row.append(value)
+                cp.write_row(row)
+    logger.info(f"COPYed {len(leads)} leads")
+    return True
+
+
+def build_job_leads(job: ScrapeJob, csv_path: str) -> Tuple[List[GmapsLead], int, List[str]]:
+    """
+    Parse a downloaded CSV into unsaved GmapsLead rows.
+
+    Does not write to the database, so callers can buffer leads across
+    several jobs and insert them in one bulk_create batch.
+
+    Args:
+        job: Parent ScrapeJob
+        csv_path: Path to the downloaded CSV file
+
+    Returns:
+        Tuple of (leads, duplicates_skipped, row error messages)
+    """
+    leads = []
+    duplicates_skipped = 0
+    errors = []
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+
+        for row_num, row in enumerate(reader, start=2):  # start=2 because row 1 is header
+            try:
+                if _find_existing_lead(row, job):
+                    duplicates_skipped += 1
+                    continue
+
+                lead = _build_lead_from_csv_row(row, job)
+                if lead:
+                    leads.append(lead)
+            except Exception as e:
+                errors.append(f"Row {row_num}: {str(e)}")
+                logger.warning(f"Failed to import row {row_num}: {e}")
+
+    return leads, duplicates_skipped, errors
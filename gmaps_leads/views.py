@@ -4,6 +4,7 @@ from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
+from django.db.models.fields.json import KeyTextTransform
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
@@ -31,6 +32,26 @@ from .signals import email_template_ready, email_template_approved
 logger = logging.getLogger(__name__)
 
 
+# Columns GmapsLeadListSerializer actually reads (plus the phone fields
+# the phone_type filter needs); list endpoints fetch only these instead
+# of pulling every JSON column per row
+LEAD_LIST_ONLY = (
+    'id', 'title', 'category', 'address', 'phone', 'phone_normalized',
+    'website', 'review_count', 'review_rating', 'city', 'created_at',
+)
+
+
+def with_address_parts(qs):
+    """
+    Annotate country from complete_address so the lead serializers read a
+    plain column; the JSON key extraction runs in the database instead of
+    per object in Python. (city is already a denormalized model column.)
+    """
+    return qs.annotate(
+        country=KeyTextTransform('country', 'complete_address'),
+    )
+
+
 # =============================================================================
 # API ViewSets (DRF)
 # =============================================================================
@@ -111,7 +132,7 @@ class ScrapeJobViewSet(viewsets.ModelViewSet):
     def leads(self, request, pk=None):
         """Get leads for this job."""
         job = self.get_object()
-        leads = job.leads.all()
+        leads = with_address_parts(job.leads.only(*LEAD_LIST_ONLY))
         serializer = GmapsLeadListSerializer(leads, many=True)
         return Response(serializer.data)
 
@@ -137,7 +158,11 @@ class GmapsLeadViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Filter leads by user's jobs and admin-style filters."""
-        qs = GmapsLead.objects.all()
+        qs = with_address_parts(GmapsLead.objects.all())
+        if self.action == 'list':
+            # The list serializer reads a handful of columns; skip the
+            # heavy JSON fields entirely
+            qs = qs.only(*LEAD_LIST_ONLY)
         req = self.request
         if req.user.is_authenticated:
             qs = qs.filter(job__created_by=req.user)
@@ -457,7 +482,11 @@ class LeadContextAPIView(APIView):
     )
     def get(self, request, lead_id):
         """Get lead context for AI email generation."""
-        qs = GmapsLead.objects.select_related('website_data')
+        # The context serializer never reads raw_html; defer it so the
+        # join doesn't drag the heaviest column along
+        qs = GmapsLead.objects.select_related('website_data').defer(
+            'website_data__raw_html'
+        )
         if request.user.is_authenticated:
             qs = qs.filter(job__created_by=request.user)
         lead = get_object_or_404(qs, pk=lead_id)
@@ -566,7 +595,9 @@ class EmailTemplateAPIView(APIView):
     
     def get_template(self, request, template_id):
         """Get template with permission check."""
-        qs = CustomizedContact.objects.all()
+        # The serializer reads lead.title and target_email resolution
+        # walks to website_data; join both up front
+        qs = CustomizedContact.objects.select_related('lead', 'lead__website_data')
         if request.user.is_authenticated:
             qs = qs.filter(lead__job__created_by=request.user)
         return get_object_or_404(qs, pk=template_id)
@@ -637,7 +668,7 @@ class EmailTemplateStatusAPIView(GenericAPIView):
     )
     def patch(self, request, template_id):
         """Update email template status."""
-        qs = CustomizedContact.objects.all()
+        qs = CustomizedContact.objects.select_related('lead')
         if request.user.is_authenticated:
             qs = qs.filter(lead__job__created_by=request.user)
         template = get_object_or_404(qs, pk=template_id)
@@ -754,11 +785,15 @@ class LeadsWithEmailsAPIView(APIView):
         """List leads with available emails."""
         from django.db.models import Exists, OuterRef
         
-        # Start with leads that have website data with emails
-        leads = GmapsLead.objects.filter(
-            Q(website_data__emails__len__gt=0) |
+        # Start with leads that have website data with emails. The
+        # denormalized indexed boolean replaces the per-row JSON length
+        # call and its join.
+        # The list serializer never touches website_data, so no join; and
+        # only the columns it renders are fetched
+        leads = with_address_parts(GmapsLead.objects.filter(
+            Q(has_contactable_email=True) |
             Q(emails__isnull=False)
-        ).select_related('website_data').distinct()
+        ).only(*LEAD_LIST_ONLY).distinct())
         if request.user.is_authenticated:
             leads = leads.filter(job__created_by=request.user)
         
@@ -811,11 +846,11 @@ class ContactableLeadsAPIView(APIView):
             limit = 10
         limit = min(max(limit, 1), 200)
 
-        leads = GmapsLead.objects.filter(
+        leads = with_address_parts(GmapsLead.objects.filter(
             Q(phone__isnull=False) & ~Q(phone__exact='') |
             Q(emails__isnull=False) & ~Q(emails__exact='') |
-            Q(website_data__emails__len__gt=0)
-        )
+            Q(has_contactable_email=True)
+        ).only(*LEAD_LIST_ONLY))
         if category:
             leads = leads.filter(category__icontains=category)
         if request.user.is_authenticated:
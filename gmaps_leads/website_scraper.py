@@ -319,66 +319,99 @@ class WebsiteScraper:
         return text[:50000] if text else None
 
 
-def scrape_lead_website(lead, force: bool = False) -> Optional['LeadWebsite']:
-    """
-    Scrape website for a lead and save the data.
-    
-    Args:
-        lead: GmapsLead instance
-        force: If True, re-scrape even if already scraped
-        
-    Returns:
-        LeadWebsite instance or None if no website
-    """
-    from .models import LeadWebsite
-    
-    if not lead.website:
-        return None
-    
-    # Check if already scraped
-    existing = LeadWebsite.objects.filter(lead=lead).first()
-    if existing and not force:
-        return existing
-    
-    # Scrape the website
-    scraper = WebsiteScraper()
-    result = scraper.scrape(lead.website)
-    
-    # Create or update LeadWebsite
-    if existing:
-        website_data = existing
-    else:
-        website_data = LeadWebsite(lead=lead)
-    
-    # Update fields
+# Fields written by a scrape; also the update set for bulk upserts
+SCRAPE_RESULT_FIELDS = [
+    'url', 'final_url', 'status', 'error_message', 'http_status_code',
+    'emails', 'emails_count', 'page_title', 'meta_description',
+    'meta_keywords', 'headings', 'paragraphs', 'navigation_links',
+    'footer_content', 'phone_numbers', 'social_links', 'full_text',
+    'full_text_length', 'raw_html', 'scraped_at',
+]
+
+
+def _apply_scrape_result(website_data, lead, result):
+    """Copy a scrape result dict onto a LeadWebsite instance (unsaved)."""
     website_data.url = lead.website
     website_data.final_url = result.get('final_url')
     website_data.status = result.get('status', 'failed')
     website_data.error_message = result.get('error_message')
     website_data.http_status_code = result.get('http_status_code')
-    
+
     website_data.emails = result.get('emails', [])
     website_data.emails_count = len(result.get('emails', []))
-    
+
     website_data.page_title = result.get('page_title')
     website_data.meta_description = result.get('meta_description')
     website_data.meta_keywords = result.get('meta_keywords')
-    
+
     website_data.headings = result.get('headings', {})
     website_data.paragraphs = result.get('paragraphs', [])
     website_data.navigation_links = result.get('navigation_links', [])
     website_data.footer_content = result.get('footer_content')
-    
+
     website_data.phone_numbers = result.get('phone_numbers', [])
     website_data.social_links = result.get('social_links', {})
-    
+
     website_data.full_text = result.get('full_text')
     website_data.full_text_length = len(result.get('full_text', '') or '')
-    
-    # Don't store raw HTML by default (save space)
-    # website_data.raw_html = result.get('raw_html')
-    
+
+    # Raw HTML is stored zlib-compressed (typically 4-6x smaller than
+    # plaintext); the raw_html_text property handles the round-trip
+    website_data.raw_html_text = result.get('raw_html')
+
     website_data.scraped_at = timezone.now()
+    return website_data
+
+
+def build_lead_website(lead) -> Optional['LeadWebsite']:
+    """
+    Scrape website for a lead and return an unsaved LeadWebsite.
+
+    Lets callers batch persistence (bulk_create upserts) instead of
+    paying one INSERT/UPDATE round-trip per lead.
+
+    Args:
+        lead: GmapsLead instance
+
+    Returns:
+        Unsaved LeadWebsite instance or None if no website
+    """
+    from .models import LeadWebsite
+
+    if not lead.website:
+        return None
+
+    scraper = WebsiteScraper()
+    result = scraper.scrape(lead.website)
+    return _apply_scrape_result(LeadWebsite(lead=lead), lead, result)
+
+
+def scrape_lead_website(lead, force: bool = False) -> Optional['LeadWebsite']:
+    """
+    Scrape website for a lead and save the data.
+
+    Args:
+        lead: GmapsLead instance
+        force: If True, re-scrape even if already scraped
+
+    Returns:
+        LeadWebsite instance or None if no website
+    """
+    from .models import LeadWebsite
+
+    if not lead.website:
+        return None
+
+    # Check if already scraped
+    existing = LeadWebsite.objects.filter(lead=lead).first()
+    if existing and not force:
+        return existing
+
+    # Scrape the website
+    scraper = WebsiteScraper()
+    result = scraper.scrape(lead.website)
+
+    website_data = _apply_scrape_result(existing or LeadWebsite(lead=lead), lead, result)
     website_data.save()
-    
+
     return website_data